@@ -0,0 +1,105 @@
+"""
+ARB 合并模块
+按文件名顺序合并多个 ARB 文件，记录每个键来自哪个文件，并检测同一个键在不同文件中取值不同的冲突
+
+文件在线程池中并行解析，按顺序逐个合并：合并第一个文件时后面的文件仍在解析。
+合并结果是只读的映射视图，可以直接当作 dict 查询，不需要再复制一份。
+"""
+
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import json_codec
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass
+class KeyConflict:
+    """同一个键在多个文件中的取值不同"""
+    key: str
+    # (文件路径, 值)，按合并顺序排列，最后一个是生效的值
+    values: List[tuple] = field(default_factory=list)
+
+
+class MergedArb(Mapping):
+    """
+    合并后的 ARB 视图
+
+    像 dict 一样按键查询值，另外可以查询键的来源文件。同一个键出现在多个文件中时后面的文件生效
+    （与 dict.update 一致），但文件顺序是确定的；取值不同的重复键记录在 conflicts 中。
+    """
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.values: Dict[str, Any] = {}
+        self.sources: Dict[str, int] = {}
+        self.conflicts: Dict[str, KeyConflict] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.values
+
+    def source(self, key: str) -> str:
+        """键生效值所在的文件"""
+        return self.files[self.sources[key]]
+
+    def add_file(self, file_path: str, data: Dict[str, Any]):
+        """合并一个文件的内容"""
+        file_id = len(self.files)
+        self.files.append(file_path)
+        values = self.values
+        sources = self.sources
+        for key, value in data.items():
+            if key in values:
+                conflict = self.conflicts.get(key)
+                if conflict is not None:
+                    conflict.values.append((file_path, value))
+                elif values[key] != value:
+                    self.conflicts[key] = KeyConflict(key, [(self.files[sources[key]], values[key]), (file_path, value)])
+            values[key] = value
+            sources[key] = file_id
+
+
+def merge_arb_file_list(file_paths: Iterable[str], max_workers: Optional[int] = DEFAULT_WORKERS) -> MergedArb:
+    """
+    并行解析并按文件名顺序合并 ARB 文件
+
+    Raises:
+        ValueError: 如果某个文件不是有效的 JSON（异常信息中包含文件路径）
+        OSError: 如果文件无法读取
+    """
+    file_paths = sorted(file_paths)
+    merged = MergedArb()
+
+    def load(file_path):
+        try:
+            return json_codec.load_file(file_path)
+        except ValueError as e:
+            raise ValueError(f"{file_path}: {e}") from e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map 按提交顺序返回结果，先解析完的文件会等待前面的文件合并
+        for file_path, data in zip(file_paths, executor.map(load, file_paths)):
+            merged.add_file(file_path, data)
+    return merged
+
+
+def describe_conflict(conflict: KeyConflict) -> str:
+    """冲突的单行描述，例如 key: a.arb="x"，b.arb="y"（生效）"""
+    parts = []
+    for index, (file_path, value) in enumerate(conflict.values):
+        suffix = "（生效）" if index == len(conflict.values) - 1 else ""
+        parts.append(f"{os.path.basename(file_path)}={json_codec.dumps_compact(value)}{suffix}")
+    return f"{conflict.key}: {'，'.join(parts)}"
@@ -0,0 +1,127 @@
+"""
+JSON 编解码基准测试
+用随机生成的 ARB 数据比较标准库 json 与 json_codec（安装了 orjson 时使用 orjson）的解析和格式化输出耗时，
+并检查两者的输出是否逐字节一致
+
+用法:
+    python scripts/benchmark_json_codec.py --keys 20000 --locales 15 --output build/localizations/json_benchmark.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+import json_codec
+from print_utils import print_step, print_info, print_success, print_error
+
+# 生成文案使用的片段，覆盖中日韩文字、拉丁字母、转义字符和 ICU 占位符
+TEXT_FRAGMENTS = [
+    '确认', '提交订单', '余额不足', '交易成功', '资产', '划转', '手续费',
+    'Confirm', 'Submit order', 'Insufficient balance', 'Transfer', 'Fee',
+    '注文を確定', '잔액 부족', 'Transferência', 'Überweisung',
+    '{amount}', '{symbol}', '{count, plural, one{# item} other{# items}}',
+    '"quoted"', 'line\nbreak', 'https://example.com/help', '100%',
+]
+
+
+def generate_arb(locale: str, key_count: int, seed: int) -> Dict[str, str]:
+    """生成一个 ARB 文件的数据：@@locale 加上 key_count 个随机文案"""
+    rng = random.Random(seed)
+    data = {'@@locale': locale}
+    for index in range(key_count):
+        fragments = rng.sample(TEXT_FRAGMENTS, rng.randint(1, 4))
+        data[f"appstrings_key_{index:06d}"] = ' '.join(fragments)
+    return data
+
+
+def best_of(func: Callable[[], object], repeats: int) -> float:
+    """多次执行取最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stdlib_dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def stdlib_loads(content: bytes):
+    return json.loads(content.decode('utf-8'))
+
+
+def run_benchmark(key_count: int, locale_count: int, repeats: int) -> Dict:
+    """
+    执行基准测试
+
+    Returns:
+        Dict: 每种实现的解析和输出耗时（毫秒），以及输出是否一致
+    """
+    documents = [generate_arb(f"locale_{index}", key_count, seed=index) for index in range(locale_count)]
+    encoded = [stdlib_dumps(data) for data in documents]
+    total_bytes = sum(len(content) for content in encoded)
+
+    identical = all(json_codec.dumps_bytes(data) == content for data, content in zip(documents, encoded))
+    round_trip = all(json_codec.loads(content) == data for data, content in zip(documents, encoded))
+
+    implementations = {
+        'json': (stdlib_loads, stdlib_dumps),
+        f"json_codec ({json_codec.BACKEND})": (json_codec.loads, json_codec.dumps_bytes),
+    }
+    results = {}
+    for name, (loads, dumps) in implementations.items():
+        load_seconds = best_of(lambda: [loads(content) for content in encoded], repeats)
+        dump_seconds = best_of(lambda: [dumps(data) for data in documents], repeats)
+        results[name] = {'load_ms': load_seconds * 1000, 'dump_ms': dump_seconds * 1000}
+
+    return {
+        'backend': json_codec.BACKEND,
+        'keys_per_file': key_count,
+        'files': locale_count,
+        'total_bytes': total_bytes,
+        'byte_identical': identical,
+        'round_trip': round_trip,
+        'results': results,
+    }
+
+
+def print_report(report: Dict):
+    print_step("JSON", f"{report['files']} 个 ARB 文件 × {report['keys_per_file']} 个键，"
+                       f"共 {report['total_bytes'] / 1024 / 1024:.1f} MB")
+    baseline = report['results']['json']
+    for name, timing in report['results'].items():
+        print_info(f"{name:<22} 解析 {timing['load_ms']:9.1f} ms ({baseline['load_ms'] / timing['load_ms']:4.1f}x)  "
+                   f"输出 {timing['dump_ms']:9.1f} ms ({baseline['dump_ms'] / timing['dump_ms']:4.1f}x)")
+    if report['byte_identical'] and report['round_trip']:
+        print_success("json_codec 的输出与标准库逐字节一致")
+    else:
+        print_error("json_codec 的输出与标准库不一致")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="比较标准库 json 与 json_codec 的 ARB 解析和输出耗时")
+    parser.add_argument('--keys', type=int, default=20000, help='每个 ARB 文件的键数量，默认 20000')
+    parser.add_argument('--locales', type=int, default=15, help='ARB 文件数量，默认 15')
+    parser.add_argument('--repeats', type=int, default=3, help='每项测试重复次数（取最短耗时），默认 3')
+    parser.add_argument('--output', help='将结果写入 JSON 文件')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    report = run_benchmark(args.keys, args.locales, args.repeats)
+    print_report(report)
+    if args.output:
+        json_codec.write_file(args.output, report, trailing_newline=True)
+        print_success(f"结果已写入: {args.output}")
+    if not (report['byte_identical'] and report['round_trip']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+翻译脚本基准测试
+生成不同规模的 ARB、模板JSON 和 lingo 语言文件语料，测量各个脚本核心函数的耗时，结果写入 JSON 文件
+
+用法:
+    python scripts/benchmark_suite.py --keys 1000 10000 100000 --locales 5 15 50 --output benchmark_results.json
+
+每个规模都会在临时目录中生成一套独立的语料，测量完成后删除（--keep 保留）。
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import json_codec
+from benchmark_json_codec import generate_arb
+from print_utils import print_step, print_info, print_success, print_error
+
+# 语料中的功能模块及其 feature-strings 配置
+FEATURE_STRINGS = {'app': 'app_strings', 'trade': 'trade_strings', 'asset': 'asset_strings'}
+LINGO_PREFIX = 'app_'
+SOURCE_LOCALE = 'zh_Hans_CN'
+
+# 语料中的比例：其他语言缺失的键、待翻译的新键、模板JSON中缺失的键
+MISSING_RATIO = 0.02
+NEW_KEY_RATIO = 0.05
+TEMPLATE_MISSING_RATIO = 0.05
+
+# 语料中模板JSON的位置（相对语料根目录），与 as_i18n.yaml 的默认 i18n-dir、template-json-file 一致
+CORPUS_I18N_DIR = os.path.join('lib', 'localizations')
+CORPUS_TEMPLATE_FILE = 'as_i18n.json'
+
+# 生成的 strings ARB 文件数量（对应 build/localizations/arb 下按功能拆分的文件）
+GENERATED_ARB_FILES = 10
+
+BENCHMARKS = [
+    'validate_arb_files',
+    'sort_arb_file',
+    'process_locale_file',
+    'merge_arb_files',
+    'compare_arb_files',
+    'convert_to_lingo_format',
+    'compare_arb_and_json',
+]
+
+
+def corpus_locales(locale_count: int) -> List[str]:
+    """语料使用的语言：源语言、en_US，其余用编号补齐"""
+    locales = [SOURCE_LOCALE, 'en_US']
+    locales += [f"xx_{index:02d}" for index in range(max(0, locale_count - len(locales)))]
+    return locales[:locale_count]
+
+
+def feature_key(index: int) -> str:
+    """按编号生成属于某个功能模块的 ARB 键"""
+    features = list(FEATURE_STRINGS.values())
+    prefix = features[index % len(features)].replace('_', '') + '_'
+    return f"{prefix}key_{index:06d}"
+
+
+def rename_keys(data: Dict[str, str]) -> Dict[str, str]:
+    """把 generate_arb 生成的键替换为分布在各功能模块中的键"""
+    result = {'@@locale': data['@@locale']}
+    values = [value for key, value in data.items() if key != '@@locale']
+    for index, value in enumerate(values):
+        result[feature_key(index)] = value
+    return result
+
+
+class Corpus:
+    """
+    一套基准测试语料
+
+    目录结构与项目一致：
+        assets/translations/intl_<locale>.arb   已有翻译（键顺序打乱，用于测量排序）
+        build/localizations/arb/*.arb           generate_new_strings 生成的 ARB（包含待翻译的新键）
+        lingo-sync/src/locales/<lang>.js        lingo 拉取的语言文件
+        lib/localizations/as_i18n.json          模板JSON
+    """
+
+    def __init__(self, root: str, key_count: int, locale_count: int, seed: int = 0):
+        self.root = root
+        self.key_count = key_count
+        self.locales = corpus_locales(locale_count)
+        self.translations_dir = os.path.join(root, 'assets', 'translations')
+        self.unsorted_dir = os.path.join(root, 'unsorted')
+        self.generated_arb_dir = os.path.join(root, 'build', 'localizations', 'arb')
+        self.lingo_dir = os.path.join(root, 'lingo-sync', 'src', 'locales')
+        self.template_path = os.path.join(root, CORPUS_I18N_DIR, CORPUS_TEMPLATE_FILE)
+        self.template: Dict[str, str] = {}
+        self.template_mtime_ns = 0
+        self.rng = random.Random(seed)
+        self.locale_data: Dict[str, Dict[str, str]] = {}
+        self.new_keys: Dict[str, str] = {}
+
+    def generate(self):
+        for directory in (self.translations_dir, self.unsorted_dir, self.generated_arb_dir,
+                          self.lingo_dir, os.path.dirname(self.template_path)):
+            os.makedirs(directory, exist_ok=True)
+
+        total_keys = int(self.key_count * (1 + NEW_KEY_RATIO))
+        existing_count = self.key_count
+        for index, locale in enumerate(self.locales):
+            data = rename_keys(generate_arb(locale, total_keys, seed=index))
+            keys = [key for key in data if key != '@@locale']
+            if locale == SOURCE_LOCALE:
+                self.new_keys = {key: data[key] for key in keys[existing_count:]}
+            translated = {key: data[key] for key in keys[:existing_count]
+                          if locale == SOURCE_LOCALE or self.rng.random() >= MISSING_RATIO}
+            self.locale_data[locale] = translated
+            self._write_arb(locale, translated)
+            self._write_lingo_js(locale, translated)
+
+        # 与实际流程一致：generate_new_strings 生成的 ARB 比模板JSON新
+        self._write_template()
+        self._write_generated_arbs()
+
+    def _write_arb(self, locale: str, translations: Dict[str, str]):
+        items = list(translations.items())
+        self.rng.shuffle(items)
+        data = {'@@locale': locale, **dict(items)}
+        file_name = f"intl_{locale}.arb"
+        json_codec.write_file(os.path.join(self.unsorted_dir, file_name), data, trailing_newline=True)
+        json_codec.write_file(os.path.join(self.translations_dir, file_name), data, trailing_newline=True)
+
+    def _write_lingo_js(self, locale: str, translations: Dict[str, str]):
+        lingo_locale = {'zh_Hans_CN': 'zh_CN', 'zh_Hant_HK': 'zh_HK'}.get(locale, locale)
+        with open(os.path.join(self.lingo_dir, f"{lingo_locale}.js"), 'w', encoding='utf-8') as f:
+            f.write('let json = {\n// lingo-start\n')
+            for key, value in translations.items():
+                # 与 lingoconfig.json 的 valueReplaces 一致：转义双引号，换行写成续行
+                value = value.replace('"', '\\"').replace('\n', '\\\n')
+                f.write(f'  "{LINGO_PREFIX}{key}": "{value}",\n')
+            f.write('// lingo-end\n}\nexport default json\n')
+
+    def _write_generated_arbs(self):
+        source = {**self.locale_data[SOURCE_LOCALE], **self.new_keys}
+        keys = list(source)
+        chunk_size = max(1, len(keys) // GENERATED_ARB_FILES + 1)
+        for index in range(0, len(keys), chunk_size):
+            chunk = {key: source[key] for key in keys[index:index + chunk_size]}
+            json_codec.write_file(os.path.join(self.generated_arb_dir, f"strings_{index // chunk_size}.arb"), chunk)
+
+    def _write_template(self):
+        source = self.locale_data[SOURCE_LOCALE]
+        self.template = {key: value for key, value in source.items() if self.rng.random() >= TEMPLATE_MISSING_RATIO}
+        json_codec.write_file(self.template_path, self.template)
+        self.template_mtime_ns = os.stat(self.template_path).st_mtime_ns
+
+    def reset_template(self):
+        """恢复被同步修改过的模板JSON，修改时间也恢复，保持比生成的 ARB 旧"""
+        json_codec.write_file(self.template_path, self.template)
+        os.utime(self.template_path, ns=(self.template_mtime_ns, self.template_mtime_ns))
+
+    def reset_unsorted(self):
+        """把 translations 目录恢复为键顺序打乱的状态"""
+        for file_name in os.listdir(self.unsorted_dir):
+            shutil.copyfile(os.path.join(self.unsorted_dir, file_name),
+                            os.path.join(self.translations_dir, file_name))
+
+    def arb_files(self) -> List[str]:
+        return sorted(os.path.join(self.translations_dir, f"intl_{locale}.arb") for locale in self.locales)
+
+
+@contextlib.contextmanager
+def quiet():
+    """屏蔽被测函数的终端输出"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def patch_module(module, **values):
+    """临时替换模块级的变量或函数"""
+    previous = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(module, name, value)
+
+
+@contextlib.contextmanager
+def module_root(module, root: str, locales: Optional[List[str]] = None):
+    """让依赖模块级 project_root（以及 get_locales）的函数在语料目录中运行"""
+    patches = {'project_root': root}
+    if locales is not None:
+        patches['get_locales'] = lambda: list(locales)
+    with patch_module(module, **patches):
+        yield
+
+
+def measure(func: Callable[[], object], repeats: int, setup: Optional[Callable[[], None]] = None) -> Dict:
+    """执行 repeats 次，setup 不计入耗时；返回最短和平均耗时（秒）"""
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        with quiet():
+            start = time.perf_counter()
+            try:
+                func()
+            except SystemExit:
+                # validate_arb_files 在发现缺失键时会退出，语料中有意包含缺失键
+                pass
+            timings.append(time.perf_counter() - start)
+    return {'best_seconds': min(timings), 'mean_seconds': sum(timings) / len(timings)}
+
+
+def run_corpus_benchmarks(corpus: Corpus, repeats: int, selected: List[str]) -> Dict[str, Dict]:
+    """在一套语料上执行所选的基准测试"""
+    import compare_arb_and_json
+    import diff_to_lingo
+    import import_from_lingo
+    import translations_to_diff
+    import validate_translations
+    from feature_index import FeaturePrefixIndex
+
+    lingo_locales = [{'zh_Hans_CN': 'zh_CN', 'zh_Hant_HK': 'zh_HK'}.get(locale, locale) for locale in corpus.locales]
+    zh_lingo_file = os.path.join(corpus.lingo_dir, 'zh_CN.js')
+    en_data = {key: f"EN {value}" for key, value in corpus.new_keys.items()}
+    other_data = {lang: {key: f"{lang} {value}" for key, value in corpus.new_keys.items()}
+                  for lang in lingo_locales if lang not in ('zh_CN', 'en_US')}
+    feature_index = FeaturePrefixIndex(FEATURE_STRINGS)
+
+    def run_validate():
+        with working_directory(corpus.root):
+            validate_translations.validate_arb_files(sort=False)
+
+    def run_sort():
+        for arb_file in corpus.arb_files():
+            validate_translations.sort_arb_file(arb_file)
+
+    def run_compare():
+        with module_root(translations_to_diff, corpus.root, corpus.locales):
+            translations_to_diff.compare_arb_files()
+
+    def run_merge():
+        with module_root(translations_to_diff, corpus.root):
+            translations_to_diff.merge_arb_files()
+
+    def run_compare_arb_and_json():
+        # 执行脚本的完整入口（加载、计算变更集、写入变更集和模板JSON），配置指向语料目录
+        with patch_module(compare_arb_and_json,
+                          get_project_root=lambda: corpus.root,
+                          get_i18n_dir=lambda: CORPUS_I18N_DIR,
+                          get_template_json_file=lambda: CORPUS_TEMPLATE_FILE,
+                          get_feature_strings=lambda: dict(FEATURE_STRINGS),
+                          get_feature_index=lambda: feature_index):
+            compare_arb_and_json.main(['--sync', '--overwrite'])
+
+    benchmarks = {
+        'validate_arb_files': (run_validate, None),
+        'sort_arb_file': (run_sort, corpus.reset_unsorted),
+        'process_locale_file': (
+            lambda: import_from_lingo.process_locale_file(zh_lingo_file, SOURCE_LOCALE, LINGO_PREFIX), None),
+        'merge_arb_files': (run_merge, None),
+        'compare_arb_files': (run_compare, None),
+        'convert_to_lingo_format': (
+            lambda: diff_to_lingo.convert_to_lingo_format(corpus.new_keys, en_data, sorted(lingo_locales), other_data),
+            None),
+        'compare_arb_and_json': (run_compare_arb_and_json, corpus.reset_template),
+    }
+
+    results = {}
+    for name in selected:
+        func, setup = benchmarks[name]
+        results[name] = measure(func, repeats, setup)
+        print_info(f"{name:<26} {results[name]['best_seconds'] * 1000:10.1f} ms")
+    return results
+
+
+def git_revision() -> Dict:
+    """被测代码所在 git 仓库的提交和是否有未提交的修改，无法获取时为 None"""
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_dir,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo_dir,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': bool(status.strip())}
+
+
+def run_suite(key_counts: List[int], locale_counts: List[int], repeats: int, selected: List[str],
+              keep: bool = False) -> Dict:
+    runs = []
+    for key_count in key_counts:
+        for locale_count in locale_counts:
+            print_step("BENCH", f"{key_count} 个键 × {locale_count} 种语言")
+            root = tempfile.mkdtemp(prefix=f"i18n_bench_{key_count}_{locale_count}_")
+            try:
+                corpus = Corpus(root, key_count, locale_count)
+                start = time.perf_counter()
+                corpus.generate()
+                print_info(f"语料生成耗时 {time.perf_counter() - start:.1f}s: {root}")
+                results = run_corpus_benchmarks(corpus, repeats, selected)
+            finally:
+                if not keep:
+                    shutil.rmtree(root, ignore_errors=True)
+            runs.append({'keys': key_count, 'locales': locale_count, 'results': results})
+
+    return {
+        'environment': {
+            **git_revision(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'json_backend': json_codec.BACKEND,
+        },
+        'repeats': repeats,
+        'runs': runs,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="生成合成语料并测量翻译脚本核心函数的耗时")
+    parser.add_argument('--keys', type=int, nargs='+', default=[1000, 10000],
+                        help='每种语言的键数量，可指定多个（1000 到 100000），默认 1000 10000')
+    parser.add_argument('--locales', type=int, nargs='+', default=[5, 15],
+                        help='语言数量，可指定多个（5 到 50），默认 5 15')
+    parser.add_argument('--repeats', type=int, default=3, help='每项测试重复次数，默认 3')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='只执行指定的测试')
+    parser.add_argument('--output', default='benchmark_results.json', help='结果文件路径，默认 benchmark_results.json')
+    parser.add_argument('--keep', action='store_true', help='保留生成的语料目录')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if any(count < 2 for count in args.locales):
+        print_error("语言数量至少为 2（源语言和 en_US）")
+        sys.exit(1)
+
+    report = run_suite(args.keys, args.locales, args.repeats, args.only or BENCHMARKS, args.keep)
+    json_codec.write_file(args.output, report, trailing_newline=True)
+    print_success(f"基准测试结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
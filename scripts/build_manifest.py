@@ -0,0 +1,139 @@
+"""
+构建清单模块
+记录流水线每个步骤输入和输出文件的内容哈希，用于判断步骤是否需要重新执行
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import json_codec
+
+MANIFEST_VERSION = 1
+
+
+def expand_patterns(patterns: List[str]) -> List[str]:
+    """展开 glob 模式，返回排序后的文件列表"""
+    files = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            files.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+        elif os.path.isfile(pattern):
+            files.add(pattern)
+    return sorted(files)
+
+
+def sha256_file(file_path: str) -> str:
+    """计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    构建清单
+
+    清单结构:
+        {
+          "version": 1,
+          "files": {路径: {"mtime_ns", "size", "sha256"}},
+          "steps": {步骤名: {"inputs": {路径: sha256}, "outputs": {路径: sha256}, "result": ...}}
+        }
+
+    files 是哈希缓存：文件的修改时间和大小都没变时直接复用记录的哈希，不重新读取文件内容，
+    因此无变化时的检查只需要 stat 调用。
+    """
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self.lock = threading.Lock()
+        data = self._load()
+        self.files: Dict[str, Dict[str, Any]] = data.get('files', {})
+        self.steps: Dict[str, Dict[str, Any]] = data.get('steps', {})
+
+    def _load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            data = json_codec.load_file(self.manifest_path)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data
+
+    def save(self):
+        """原子地写入清单文件"""
+        with self.lock:
+            data = {'version': MANIFEST_VERSION, 'files': self.files, 'steps': self.steps}
+            os.makedirs(os.path.dirname(os.path.abspath(self.manifest_path)), exist_ok=True)
+            temp_path = f"{self.manifest_path}.tmp"
+            json_codec.write_file(temp_path, data)
+            os.replace(temp_path, self.manifest_path)
+
+    def file_hash(self, file_path: str) -> str:
+        """获取文件内容哈希，stat 未变化时使用缓存"""
+        stat = os.stat(file_path)
+        with self.lock:
+            cached = self.files.get(file_path)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                return cached['sha256']
+
+        file_sha = sha256_file(file_path)
+        with self.lock:
+            self.files[file_path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': file_sha}
+        return file_sha
+
+    def hash_patterns(self, patterns: List[str]) -> Dict[str, str]:
+        """计算所有匹配文件的内容哈希"""
+        return {file_path: self.file_hash(file_path) for file_path in expand_patterns(patterns)}
+
+    def is_up_to_date(self, name: str, inputs: List[str], outputs: List[str]) -> bool:
+        """
+        判断步骤是否无需重新执行
+
+        输入文件集合及其内容与上次执行后一致，且每个输出模式都匹配到文件、
+        输出文件集合及其内容也与上次一致时返回 True。
+        """
+        with self.lock:
+            record = self.steps.get(name)
+        if not record or not inputs:
+            return False
+        if any(not expand_patterns([pattern]) for pattern in outputs):
+            return False
+        return (self.hash_patterns(inputs) == record.get('inputs')
+                and self.hash_patterns(outputs) == record.get('outputs'))
+
+    def get_result(self, name: str) -> Optional[Any]:
+        with self.lock:
+            return self.steps.get(name, {}).get('result')
+
+    def record(self, name: str, inputs: List[str], outputs: List[str], result: Any):
+        """记录步骤执行后的输入、输出哈希和结果"""
+        input_hashes = self.hash_patterns(inputs)
+        output_hashes = self.hash_patterns(outputs)
+        with self.lock:
+            self.steps[name] = {'inputs': input_hashes, 'outputs': output_hashes, 'result': result}
+
+    def refresh_outputs(self, name: str, outputs: List[str]):
+        """
+        重新记录步骤的输出哈希
+
+        下游步骤可能会原地修改上游的输出（例如 check_and_fix_sid 修改 generate 生成的文件），
+        整个流水线成功后以最终的文件内容为准。
+        """
+        output_hashes = self.hash_patterns(outputs)
+        with self.lock:
+            if name in self.steps:
+                self.steps[name]['outputs'] = output_hashes
+
+    def forget(self, name: str):
+        """删除步骤记录，下次必须重新执行"""
+        with self.lock:
+            self.steps.pop(name, None)
@@ -1,11 +1,55 @@
+import argparse
+import glob
 import os
-import re
-import ast
-import json
-import subprocess
-import shutil
-from config_utils import get_lingo_prefix, get_locales, get_project_root, get_feature_strings, get_i18n_dir, get_template_json_file
+from dataclasses import dataclass, field
+from typing import Dict, List
+from config_utils import get_project_root, get_feature_strings, get_i18n_dir, get_template_json_file
 from print_utils import print_step, print_info, print_success, print_error
+from feature_index import get_feature_index
+from arb_merge import merge_arb_file_list
+import json_codec
+from json_stream import write_json_items
+
+# 不属于任何功能模块的键最多打印的数量
+MAX_PRINTED_UNOWNED_KEYS = 20
+
+# 模板JSON中的值以该语言的 ARB 为准
+SOURCE_LOCALE = 'zh_Hans_CN'
+
+# 变更集默认输出路径（相对于项目根目录）
+DEFAULT_CHANGE_SET_PATH = os.path.join('build', 'localizations', 'template_change_set.json')
+
+
+@dataclass
+class TemplateChangeSet:
+    """
+    ARB 文件与模板JSON之间的差异
+
+    Attributes:
+        added: 源语言 ARB 中有、模板JSON中没有的功能键 {键: 值}
+        changed: 两边都有但值不同的键 {键: {"old": 模板中的值, "new": ARB 中的值}}
+        removed: 模板JSON中的功能键，所有语言的 ARB 和 build/localizations/arb（源码生成的 ARB）中都不存在
+        missing_source: 只出现在其他语言 ARB 中、源语言 ARB 缺失的功能键 {键: [语言]}
+        unowned: 源语言 ARB 中不属于任何功能模块的键（不会同步）
+    """
+    added: Dict[str, str] = field(default_factory=dict)
+    changed: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    missing_source: Dict[str, List[str]] = field(default_factory=dict)
+    unowned: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def to_dict(self) -> Dict:
+        return {
+            'source_locale': SOURCE_LOCALE,
+            'added': self.added,
+            'changed': self.changed,
+            'removed': self.removed,
+            'missing_source': self.missing_source,
+            'unowned': self.unowned,
+        }
 
 def create_missing_language_files():
     """创建缺失的语言文件"""
@@ -35,8 +79,7 @@ def load_arb_file(arb_file_path):
         return {}
     
     try:
-        with open(arb_file_path, 'r', encoding='utf-8') as f:
-            arb_data = json.load(f)
+        arb_data = json_codec.load_file(arb_file_path)
         
         # 过滤掉以@开头的元数据键
         translations = {}
@@ -56,8 +99,7 @@ def load_template_json(template_file_path):
         return {}
     
     try:
-        with open(template_file_path, 'r', encoding='utf-8') as f:
-            template_data = json.load(f)
+        template_data = json_codec.load_file(template_file_path)
         return template_data
     except Exception as e:
         print_error(f"读取模板JSON文件失败: {e}")
@@ -66,72 +108,200 @@ def load_template_json(template_file_path):
 def save_template_json(template_file_path, data):
     """保存模板JSON文件"""
     try:
-        with open(template_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_json_items(template_file_path, data.items())
         print_success(f"已更新模板JSON文件: {template_file_path}")
     except Exception as e:
         print_error(f"保存模板JSON文件失败: {e}")
 
-def should_add_key(key, feature_strings):
-    """判断是否应该添加这个键到模板JSON中"""
-    for feature_key, feature_prefix in feature_strings.items():
-        # 将feature_strings中的值转换为ARB文件中的前缀格式
-        # 例如：app_strings -> appstrings_
-        arb_prefix = feature_prefix.replace('_', '') + '_'
-        if key.startswith(arb_prefix):
-            return True
-    return False
-
-def main():
+def print_unowned_keys(unowned_keys):
+    """报告不属于任何功能模块的键"""
+    if not unowned_keys:
+        return
+    shown = unowned_keys[:MAX_PRINTED_UNOWNED_KEYS]
+    print_info(f"有 {len(unowned_keys)} 个键不属于任何 feature-strings 前缀，不会添加到模板JSON: {', '.join(shown)}"
+               + (" ..." if len(unowned_keys) > len(shown) else ""))
+
+def load_locale_arb_files(translations_dir):
+    """
+    加载 translations 目录下所有语言的 ARB 文件
+
+    Returns:
+        Dict[str, Dict[str, str]]: 语言 -> 翻译键值对（不含元数据）
+    """
+    locale_arbs = {}
+    for arb_file_path in sorted(glob.glob(os.path.join(translations_dir, 'intl_*.arb'))):
+        locale = os.path.basename(arb_file_path)[len('intl_'):-len('.arb')]
+        locale_arbs[locale] = load_arb_file(arb_file_path)
+    return locale_arbs
+
+def load_generated_keys(project_root, template_file_path=None):
+    """
+    读取 build/localizations/arb 下由源码生成的 ARB 的键
+
+    生成的 ARB 比模板JSON旧时（模板修改后还没有重新生成），其中缺少模板里刚加的键，不能用来判断删除。
+
+    Returns:
+        Set[str]: 源码中仍在使用的键；目录中没有 ARB 文件、文件比模板JSON旧或无法读取时返回 None
+    """
+    arb_files = glob.glob(os.path.join(project_root, 'build', 'localizations', 'arb', '*.arb'))
+    if not arb_files:
+        print_info("没有找到 build/localizations/arb 下的 ARB 文件，无法确认键已从源码中移除，不会删除任何键")
+        return None
+    if template_file_path and os.path.exists(template_file_path):
+        if min(os.path.getmtime(path) for path in arb_files) < os.path.getmtime(template_file_path):
+            print_info("build/localizations/arb 比模板JSON旧，请先重新生成，本次不会删除任何键")
+            return None
+    try:
+        return set(merge_arb_file_list(arb_files))
+    except (OSError, ValueError) as e:
+        print_error(f"读取 build/localizations/arb 失败，不会删除任何键: {e}")
+        return None
+
+def compute_change_set(template_data, locale_arbs, feature_index, source_locale=SOURCE_LOCALE, generated_keys=None):
+    """
+    对 ARB 文件、模板JSON和功能前缀做三方比较
+
+    所有判断都是对整个键集合的集合运算，每个键只查一次所属功能。
+    刚加入模板JSON、还没有经过 Lingo 的键不在任何语言的 ARB 中，所以只有同时不在 generated_keys
+    （源码生成的 ARB）中的键才算已删除；generated_keys 为 None 时不会判定任何键已删除。
+
+    Returns:
+        TemplateChangeSet: 模板JSON需要的变更
+    """
+    source = locale_arbs.get(source_locale, {})
+    groups, unowned = feature_index.partition(source)
+    owned_source_keys = {key for keys in groups.values() for key in keys}
+    template_keys = template_data.keys()
+
+    change_set = TemplateChangeSet(unowned=unowned)
+    # 按源语言 ARB 中的顺序记录新增的键
+    change_set.added = {key: source[key] for key in source
+                        if key in owned_source_keys and key not in template_keys}
+    for key in owned_source_keys & template_keys:
+        if source[key] != template_data[key]:
+            change_set.changed[key] = {'old': template_data[key], 'new': source[key]}
+    change_set.changed = dict(sorted(change_set.changed.items()))
+
+    present_keys = set()
+    for translations in locale_arbs.values():
+        present_keys.update(translations)
+    if generated_keys is not None:
+        change_set.removed = [key for key in template_data
+                              if key not in present_keys and key not in generated_keys
+                              and feature_index.owner(key) is not None]
+
+    for key in sorted(present_keys - source.keys()):
+        if feature_index.owner(key) is None:
+            continue
+        change_set.missing_source[key] = [locale for locale, translations in locale_arbs.items()
+                                          if key in translations]
+    return change_set
+
+def apply_change_set(template_data, change_set, sync=False, overwrite=False):
+    """
+    生成应用变更后的模板数据
+
+    始终添加新键；sync 为 True 时删除已移除的键；overwrite 为 True 时用 ARB 中的值覆盖模板中值不同的键
+    （模板中可能是还没有同步到 Lingo 的新修改，所以需要单独指定）。
+    已有键保持原来的顺序，新增的键追加在末尾。
+    """
+    removed = set(change_set.removed) if sync else set()
+    changed = change_set.changed if overwrite else {}
+    result = {}
+    for key, value in template_data.items():
+        if key in removed:
+            continue
+        result[key] = changed[key]['new'] if key in changed else value
+    result.update(change_set.added)
+    return result
+
+def print_change_set(change_set, sync, overwrite):
+    """打印变更摘要"""
+    for key in change_set.added:
+        print_info(f"添加新键: {key}")
+    if overwrite:
+        for key in change_set.changed:
+            print_info(f"更新键值: {key}")
+    elif change_set.changed:
+        print_info(f"有 {len(change_set.changed)} 个键的值与 {SOURCE_LOCALE} ARB 不同，使用 --overwrite 以 ARB 为准覆盖")
+    if sync:
+        for key in change_set.removed:
+            print_info(f"删除键: {key}")
+    elif change_set.removed:
+        print_info(f"有 {len(change_set.removed)} 个键已不在任何 ARB 和源码中，使用 --sync 删除")
+    if change_set.missing_source:
+        print_error(f"有 {len(change_set.missing_source)} 个键只存在于其他语言的 ARB 中，{SOURCE_LOCALE} 缺失，无法同步")
+    print_unowned_keys(change_set.unowned)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="将 ARB 文件中的新键同步到模板JSON文件")
+    parser.add_argument('--sync', action='store_true',
+                        help='删除所有语言 ARB 和 build/localizations/arb 中都不存在的键')
+    parser.add_argument('--overwrite', action='store_true',
+                        help=f'用 {SOURCE_LOCALE} ARB 中的值覆盖模板JSON中值不同的键（会丢弃模板中尚未同步到 Lingo 的修改）')
+    parser.add_argument('--dry-run', action='store_true', help='只输出变更集，不修改模板JSON文件')
+    parser.add_argument('--change-set', help=f'变更集输出路径，默认为 {DEFAULT_CHANGE_SET_PATH}')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print_step("COMPARE", "开始比较ARB文件和模板JSON文件")
     
-    # 1. 获取项目根目录中的assets/translations/intl_zh_Hans_CN.arb文件
+    # 1. 获取项目根目录中的assets/translations下所有语言的ARB文件
     project_root = get_project_root()
-    arb_file_path = os.path.join(project_root, 'assets', 'translations', 'intl_zh_Hans_CN.arb')
+    translations_dir = os.path.join(project_root, 'assets', 'translations')
     
     # 2. 读取config_utils配置中的 i18n-dir、template-json-file、feature-strings
     i18n_dir = get_i18n_dir()
     template_json_file = get_template_json_file()
     feature_strings = get_feature_strings()
+    feature_index = get_feature_index()
     
     template_file_path = os.path.join(project_root, i18n_dir, template_json_file)
     
-    print_info(f"ARB文件路径: {arb_file_path}")
+    print_info(f"ARB文件目录: {translations_dir}")
     print_info(f"模板JSON文件路径: {template_file_path}")
     print_info(f"功能字符串配置: {feature_strings}")
     
     # 3. 加载ARB文件和模板JSON文件
-    arb_translations = load_arb_file(arb_file_path)
+    locale_arbs = load_locale_arb_files(translations_dir)
     template_data = load_template_json(template_file_path)
     
-    if not arb_translations:
-        print_error("无法加载ARB文件，退出")
+    if not locale_arbs.get(SOURCE_LOCALE):
+        print_error(f"无法加载 intl_{SOURCE_LOCALE}.arb 文件，退出")
         return
     
     if not template_data:
         print_error("无法加载模板JSON文件，退出")
         return
     
-    print_info(f"ARB文件包含 {len(arb_translations)} 个翻译键")
+    print_info(f"共加载 {len(locale_arbs)} 个语言的 ARB 文件，{SOURCE_LOCALE} 包含 {len(locale_arbs[SOURCE_LOCALE])} 个翻译键")
     print_info(f"模板JSON文件包含 {len(template_data)} 个键")
     
-    # 4. 比较并添加缺失的键值对
-    added_count = 0
-    for key, value in arb_translations.items():
-        # 检查键是否在模板JSON中不存在
-        if key not in template_data:
-            # 检查键是否以feature-strings中的值为开头
-            if should_add_key(key, feature_strings):
-                template_data[key] = value
-                added_count += 1
-                print_info(f"添加新键: {key}")
+    # 4. 计算变更集并输出
+    generated_keys = load_generated_keys(project_root, template_file_path)
+    change_set = compute_change_set(template_data, locale_arbs, feature_index, generated_keys=generated_keys)
+    print_change_set(change_set, args.sync, args.overwrite)
+
+    change_set_path = args.change_set or os.path.join(project_root, DEFAULT_CHANGE_SET_PATH)
+    write_json_items(change_set_path, change_set.to_dict().items())
+    print_info(f"变更集已写入: {change_set_path}")
     
-    # 5. 保存更新后的模板JSON文件
-    if added_count > 0:
-        save_template_json(template_file_path, template_data)
-        print_success(f"成功添加了 {added_count} 个新的翻译键到模板JSON文件中")
+    # 5. 一次性写入更新后的模板JSON文件
+    summary = f"新增 {len(change_set.added)} 个键"
+    if args.overwrite:
+        summary += f"，更新 {len(change_set.changed)} 个键"
+    if args.sync:
+        summary += f"，删除 {len(change_set.removed)} 个键"
+    has_changes = (bool(change_set.added) or (args.overwrite and bool(change_set.changed))
+                   or (args.sync and bool(change_set.removed)))
+    if not has_changes:
+        print_info("没有需要同步的翻译键")
+    elif args.dry_run:
+        print_info(f"预览模式，未修改模板JSON文件（{summary}）")
     else:
-        print_info("没有需要添加的新翻译键")
+        save_template_json(template_file_path, apply_change_set(template_data, change_set, args.sync, args.overwrite))
+        print_success(f"模板JSON文件同步完成：{summary}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,14 +4,31 @@
 """
 
 import os
+import threading
 import yaml
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 
+# 优先使用 libyaml 提供的 C 实现解析器
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
+# 项目语言代码与 Lingo 语言代码不一致的映射，其余语言两边相同
+LINGO_LOCALE_MAPPING = {
+    'zh_Hans_CN': 'zh_CN',
+    'zh_Hant_HK': 'zh_HK',
+}
+_PROJECT_LOCALE_MAPPING = {lingo: locale for locale, lingo in LINGO_LOCALE_MAPPING.items()}
+
+
+@lru_cache(maxsize=None)
 def find_project_root() -> str:
     """
     查找包含 as_i18n.yaml 文件的主项目根目录
+
+    结果在进程内缓存，只会向上查找一次
     
     Returns:
         str: 项目根目录的绝对路径
@@ -33,27 +50,111 @@ def find_project_root() -> str:
     return fallback_root
 
 
+def _freeze(value: Any) -> Any:
+    """递归转换为只读结构：dict -> MappingProxyType，list -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """_freeze 的逆操作，返回可以随意修改的新 dict / list"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class AsI18nConfig:
+    """as_i18n.yaml 的只读配置对象（包括嵌套的字典和列表），缺失或为 null 的必填字段为 None"""
+    path: str
+    raw: Mapping[str, Any]
+    locales: Optional[Tuple[str, ...]]
+    lingo: Optional[Mapping[str, Any]]
+    openai_api_key: Optional[str]
+    openai_base_url: Optional[str]
+    feature_strings: Optional[Mapping[str, str]]
+    i18n_dir: str
+    template_json_file: str
+    output_localization_file: str
+
+    @property
+    def lingo_prefix(self) -> str:
+        if self.lingo is None:
+            return ''
+        return self.lingo.get('prefix', '')
+
+    @classmethod
+    def from_dict(cls, path: str, data: Dict[str, Any]) -> 'AsI18nConfig':
+        raw = _freeze(data)
+        return cls(
+            path=path,
+            raw=raw,
+            locales=raw.get('locales'),
+            lingo=raw.get('lingo'),
+            openai_api_key=data.get('openai-api-key'),
+            openai_base_url=data.get('openai-base-url'),
+            feature_strings=raw.get('feature-strings'),
+            i18n_dir=data.get('i18n-dir', 'lib/localizations/'),
+            template_json_file=data.get('template-json-file', 'as_i18n.json'),
+            output_localization_file=data.get('output-localization-file', 'app_localizations.dart'),
+        )
+
+
+_config_lock = threading.Lock()
+_config_cache: Dict[str, Tuple[Tuple[int, int], AsI18nConfig]] = {}
+
+
+def get_config() -> AsI18nConfig:
+    """
+    获取 as_i18n.yaml 配置对象
+
+    每个进程只解析一次，配置文件的修改时间或大小变化时自动重新加载
+
+    Returns:
+        AsI18nConfig: 只读配置对象
+
+    Raises:
+        FileNotFoundError: 如果找不到 as_i18n.yaml 文件
+        yaml.YAMLError: 如果YAML格式错误
+    """
+    config_path = get_config_path()
+
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"未找到 as_i18n.yaml 文件: {config_path}")
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _config_lock:
+        cached = _config_cache.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=YamlLoader) or {}
+
+        config = AsI18nConfig.from_dict(config_path, data)
+        _config_cache[config_path] = (signature, config)
+        return config
+
+
 def load_as_i18n_config() -> Dict[str, Any]:
     """
     加载 as_i18n.yaml 配置文件
     
     Returns:
-        Dict[str, Any]: 配置字典
+        Dict[str, Any]: 配置字典（缓存配置的深拷贝，修改它不会影响其他调用方）
         
     Raises:
         FileNotFoundError: 如果找不到 as_i18n.yaml 文件
         yaml.YAMLError: 如果YAML格式错误
     """
-    project_root = find_project_root()
-    config_path = os.path.join(project_root, 'as_i18n.yaml')
-    
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"未找到 as_i18n.yaml 文件: {config_path}")
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    
-    return config
+    return _thaw(get_config().raw)
 
 
 def get_locales() -> List[str]:
@@ -61,17 +162,43 @@ def get_locales() -> List[str]:
     从 as_i18n.yaml 文件中获取支持的语言列表
     
     Returns:
-        List[str]: 语言代码列表
+        List[str]: 语言代码列表；locales 字段为 null 时返回 None
         
     Raises:
         KeyError: 如果配置中没有 locales 字段
     """
-    config = load_as_i18n_config()
+    config = get_config()
     
-    if 'locales' not in config:
+    if 'locales' not in config.raw:
         raise KeyError("在 as_i18n.yaml 中找不到 locales 配置")
     
-    return config['locales']
+    return _thaw(config.locales)
+
+
+def get_lingo_locale(locale: str) -> str:
+    """
+    将项目语言代码转换为 Lingo 语言代码
+
+    Args:
+        locale: as_i18n.yaml 中的语言代码，例如 zh_Hans_CN
+
+    Returns:
+        str: Lingo 使用的语言代码，例如 zh_CN
+    """
+    return LINGO_LOCALE_MAPPING.get(locale, locale)
+
+
+def get_project_locale(lingo_locale: str) -> str:
+    """
+    将 Lingo 语言代码转换为项目语言代码（get_lingo_locale 的逆映射）
+
+    Args:
+        lingo_locale: Lingo 使用的语言代码，例如 zh_HK
+
+    Returns:
+        str: as_i18n.yaml 中的语言代码，例如 zh_Hant_HK
+    """
+    return _PROJECT_LOCALE_MAPPING.get(lingo_locale, lingo_locale)
 
 
 def get_lingo_config() -> Dict[str, Any]:
@@ -84,12 +211,12 @@ def get_lingo_config() -> Dict[str, Any]:
     Raises:
         KeyError: 如果配置中没有 lingo 字段
     """
-    config = load_as_i18n_config()
+    config = get_config()
     
-    if 'lingo' not in config:
+    if config.lingo is None:
         raise KeyError("在 as_i18n.yaml 中找不到 lingo 配置")
     
-    return config['lingo']
+    return _thaw(config.lingo)
 
 
 def get_lingo_prefix() -> str:
@@ -99,11 +226,7 @@ def get_lingo_prefix() -> str:
     Returns:
         str: lingo prefix，如果不存在则返回空字符串
     """
-    try:
-        lingo_config = get_lingo_config()
-        return lingo_config.get('prefix', '')
-    except KeyError:
-        return ''
+    return get_config().lingo_prefix
 
 
 def get_openai_api_key() -> str:
@@ -116,12 +239,22 @@ def get_openai_api_key() -> str:
     Raises:
         KeyError: 如果配置中没有 openai-api-key 字段
     """
-    config = load_as_i18n_config()
+    config = get_config()
     
-    if 'openai-api-key' not in config:
+    if 'openai-api-key' not in config.raw:
         raise KeyError("在 as_i18n.yaml 中找不到 openai-api-key 配置")
     
-    return config['openai-api-key']
+    return config.openai_api_key
+
+
+def get_openai_base_url() -> Optional[str]:
+    """
+    从 as_i18n.yaml 文件中获取 openai-base-url 配置
+
+    Returns:
+        Optional[str]: OpenAI 接口地址，未配置时返回 None（使用官方地址或 OPENAI_BASE_URL 环境变量）
+    """
+    return get_config().openai_base_url
 
 
 def get_feature_strings() -> Dict[str, str]:
@@ -134,12 +267,12 @@ def get_feature_strings() -> Dict[str, str]:
     Raises:
         KeyError: 如果配置中没有 feature-strings 字段
     """
-    config = load_as_i18n_config()
+    config = get_config()
     
-    if 'feature-strings' not in config:
+    if config.feature_strings is None:
         raise KeyError("在 as_i18n.yaml 中找不到 feature-strings 配置")
     
-    return config['feature-strings']
+    return _thaw(config.feature_strings)
 
 
 def get_i18n_dir() -> str:
@@ -149,8 +282,7 @@ def get_i18n_dir() -> str:
     Returns:
         str: i18n-dir 路径，默认为 'lib/localizations/'
     """
-    config = load_as_i18n_config()
-    return config.get('i18n-dir', 'lib/localizations/')
+    return get_config().i18n_dir
 
 
 def get_template_json_file() -> str:
@@ -160,8 +292,7 @@ def get_template_json_file() -> str:
     Returns:
         str: template-json-file 文件名，默认为 'as_i18n.json'
     """
-    config = load_as_i18n_config()
-    return config.get('template-json-file', 'as_i18n.json')
+    return get_config().template_json_file
 
 
 def get_output_localization_file() -> str:
@@ -171,8 +302,7 @@ def get_output_localization_file() -> str:
     Returns:
         str: output-localization-file 文件名，默认为 'app_localizations.dart'
     """
-    config = load_as_i18n_config()
-    return config.get('output-localization-file', 'app_localizations.dart')
+    return get_config().output_localization_file
 
 
 # 便捷函数：获取项目根目录
@@ -1,3 +1,5 @@
+import argparse
+import hashlib
 import os
 import json
 import sys
@@ -10,7 +12,15 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from print_utils import print_step, print_info, print_success, print_error
-from config_utils import get_locales
+from config_utils import get_locales, get_lingo_locale, get_lingo_prefix
+from lingo_js_parser import LingoParseError, iter_lingo_entries
+from lingo_snapshot import SNAPSHOT_PATH, LingoSnapshot, value_hash
+import json_codec
+from json_stream import FORMAT_ARRAY, FORMAT_JSONL, write_json_records
+
+# lingo-sync 拉取的语言文件目录，即上次从 Lingo 导入的数据
+LINGO_LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'lingo-sync', 'src', 'locales')
 
 def read_supported_languages():
     """从 as_i18n.yaml 文件的 locales 字段读取支持的语言列表"""
@@ -18,20 +28,8 @@ def read_supported_languages():
         # 获取 locales 配置
         locales = get_locales()
         
-        # 语言代码映射关系（只处理需要映射的语言）
-        locale_mapping = {
-            'zh_Hans_CN': 'zh_CN',
-            'zh_Hant_HK': 'zh_HK'
-        }
-        
-        # 转换语言代码
-        supported_languages = []
-        for locale in locales:
-            if locale in locale_mapping:
-                supported_languages.append(locale_mapping[locale])
-            else:
-                # 其他语言代码直接使用原值
-                supported_languages.append(locale)
+        # 转换语言代码（只有部分语言需要映射，其他语言代码直接使用原值）
+        supported_languages = [get_lingo_locale(locale) for locale in locales]
         
         # 确保 en_US 始终存在
         if 'en_US' not in supported_languages:
@@ -63,7 +61,7 @@ def read_diff_json():
                 print_error("diff.json 文件为空")
                 print_info("请先运行 make export_translations_diff 生成 diff.json 文件")
                 sys.exit(1)
-            zh_data = json.loads(content)
+            zh_data = json_codec.loads(content)
 
         # 读取英文翻译
         en_diff_path = os.path.join(project_root, 'build', 'localizations', 'diff_en_US.json')
@@ -78,7 +76,7 @@ def read_diff_json():
                 print_error("diff_en_US.json 文件为空")
                 print_info("请先翻译英文并生成 diff_en_US.json 文件")
                 sys.exit(1)
-            en_data = json.loads(content)
+            en_data = json_codec.loads(content)
 
         return zh_data, en_data
     except json.JSONDecodeError:
@@ -88,52 +86,170 @@ def read_diff_json():
         print_error(f"读取文件时出错: {e}")
         sys.exit(1)
 
-def convert_to_lingo_format(zh_data, en_data, supported_languages):
-    """将 diff.json 和 diff_en_US.json 数据转换为 lingo 格式"""
-    try:
-        translations = []
+def read_locale_diffs(supported_languages):
+    """
+    读取 openai_translate.py --all-locales 生成的其他语言翻译文件 diff_<语言>.json
+
+    Returns:
+        dict: 语言代码 -> 该语言的翻译字典，不存在的语言文件会被跳过
+    """
+    locale_data = {}
+    for lang in supported_languages:
+        if lang in ["zh_CN", "en_US"]:
+            continue
+        diff_path = os.path.join(project_root, 'build', 'localizations', f'diff_{lang}.json')
+        if not os.path.exists(diff_path):
+            continue
+        try:
+            locale_data[lang] = json_codec.load_file(diff_path)
+        except Exception as e:
+            print_error(f"读取 {diff_path} 时出错: {e}")
+            sys.exit(1)
+    if locale_data:
+        print_info(f"读取到 {len(locale_data)} 种其他语言的翻译: {', '.join(sorted(locale_data))}")
+    return locale_data
+
+def iter_lingo_rows(zh_data, en_data, supported_languages, locale_data=None):
+    """按键排序逐条生成 lingo 格式的翻译项"""
+    locale_data = locale_data or {}
+    other_languages = [lang for lang in supported_languages if lang not in ["zh_CN", "en_US"]]
+    for key in sorted(zh_data.keys()):
+        # 创建新的翻译项
+        translation_item = {
+            "key": key,
+            "zh_CN": zh_data[key],  # 从 diff.json 获取中文值
+            "en_US": en_data.get(key, "")  # 从 diff_en_US.json 获取英文值
+        }
         
-        # 遍历所有键
-        for key in sorted(zh_data.keys()):
-            # 创建新的翻译项
-            translation_item = {
-                "key": key,
-                "zh_CN": zh_data[key],  # 从 diff.json 获取中文值
-                "en_US": en_data.get(key, "")  # 从 diff_en_US.json 获取英文值
-            }
-            
-            # 为其他语言添加空字符串
-            for lang in supported_languages:
-                if lang not in ["zh_CN", "en_US"]:
-                    translation_item[lang] = ""
-            
-            translations.append(translation_item)
+        # 其他语言使用对应 diff 文件中的翻译，没有则为空字符串
+        for lang in other_languages:
+            translation_item[lang] = locale_data.get(lang, {}).get(key, "")
         
-        return translations
+        yield translation_item
+
+def convert_to_lingo_format(zh_data, en_data, supported_languages, locale_data=None):
+    """将 diff.json、diff_en_US.json 以及其他语言的 diff 数据转换为 lingo 格式"""
+    try:
+        return list(iter_lingo_rows(zh_data, en_data, supported_languages, locale_data))
     except Exception as e:
         print_error(f"转换数据时出错: {e}")
         sys.exit(1)
 
-def save_translations(translations):
-    """保存转换后的数据"""
+def row_cells(translation_item):
+    """翻译项中非空的语言列"""
+    return {lang: value for lang, value in translation_item.items() if lang != "key" and value}
+
+def content_hash(cells):
+    """语言列内容的哈希，与列的顺序无关"""
+    payload = json.dumps(cells, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def load_lingo_snapshot(supported_languages):
+    """
+    读取上次从 Lingo 导入的数据，键与 diff.json 中的键一致（已去掉 lingo prefix）
+
+    直接导入（import_from_lingo.py --direct）只更新 build/localizations/lingo_snapshot.json，
+    Node 版导入和 lingo_client.py 只更新 lingo-sync/src/locales/<语言>.js，因此使用两者中较新的一份。
+
+    Returns:
+        dict: 语言代码 -> {键: 值哈希}，不存在或无法解析的语言会被跳过
+    """
+    js_paths = {lang: os.path.join(LINGO_LOCALES_DIR, f"{lang}.js") for lang in supported_languages}
+    js_paths = {lang: path for lang, path in js_paths.items() if os.path.exists(path)}
+    js_mtime = max((os.path.getmtime(path) for path in js_paths.values()), default=None)
+
+    snapshot_path = os.path.join(project_root, SNAPSHOT_PATH)
+    if os.path.exists(snapshot_path) and (js_mtime is None or os.path.getmtime(snapshot_path) >= js_mtime):
+        snapshot = LingoSnapshot.load(snapshot_path)
+        if snapshot is not None:
+            print_info(f"与上次导入的快照比较: {snapshot_path}")
+            hashes = {}
+            for locale in snapshot.locales:
+                lang = get_lingo_locale(locale)
+                if lang in supported_languages:
+                    hashes[lang] = snapshot.locale_hashes(locale)
+            return hashes
+        print_info(f"{snapshot_path} 无法解析或版本不同，改用 lingo-sync 中的语言文件")
+
+    prefix = get_lingo_prefix()
+    hashes = {}
+    for lang, file_path in js_paths.items():
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                hashes[lang] = {key: value_hash(value) for key, value in iter_lingo_entries(f, prefix)}
+        except LingoParseError as e:
+            print_error(f"解析 {file_path} 时出错，忽略该语言的快照: {e}")
+    if hashes:
+        print_info(f"与 lingo-sync 中的语言文件比较: {LINGO_LOCALES_DIR}")
+    return hashes
+
+def drop_unchanged(translations, snapshot):
+    """
+    去掉与 Lingo 快照一致的键
+
+    只比较本次有内容的语言列：这些列在快照中的值与本次完全相同时，上传不会带来任何变化。
+
+    Yields:
+        dict: 需要上传的翻译项
+    """
+    for translation_item in translations:
+        if snapshot:
+            key = translation_item["key"]
+            if all(snapshot.get(lang, {}).get(key) == value_hash(value)
+                   for lang, value in row_cells(translation_item).items()):
+                continue
+        yield translation_item
+
+def to_delta_format(translations):
+    """
+    转换为紧凑的增量格式：每个键只保留非空的语言列，并附带内容哈希
+
+    例如：{"key": "...", "hash": "...", "zh_CN": "...", "en_US": "..."}
+    """
+    for translation_item in translations:
+        cells = row_cells(translation_item)
+        yield {"key": translation_item["key"], "hash": content_hash(cells), **cells}
+
+def save_translations(translations, jsonl=False):
+    """
+    逐条写入转换后的数据
+
+    translations 可以是生成器，写入时不需要在内存中保留所有翻译项
+
+    Returns:
+        int: 写入的翻译项数量
+    """
     try:
         # 使用项目根目录的绝对路径
         output_dir = os.path.join(project_root, 'build', 'localizations')
-        os.makedirs(output_dir, exist_ok=True)
         
         # 保存文件
-        output_path = os.path.join(output_dir, 'new_to_lingo.json')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(translations, f, ensure_ascii=False, indent=2)
-            f.write('\n')  # 添加最后的换行符
+        if jsonl:
+            output_path = os.path.join(output_dir, 'new_to_lingo.jsonl')
+            count = write_json_records(output_path, translations, FORMAT_JSONL)
+        else:
+            output_path = os.path.join(output_dir, 'new_to_lingo.json')
+            count = write_json_records(output_path, translations, FORMAT_ARRAY, trailing_newline=True)
         
         print_success(f"转换后的文件已保存到: {output_path}")
-        print_info(f"总共转换了 {len(translations)} 个键值对")
+        print_info(f"总共转换了 {count} 个键值对")
+        return count
     except Exception as e:
         print_error(f"保存文件时出错: {e}")
         sys.exit(1)
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="将 diff 文件转换为 Lingo 导入格式 build/localizations/new_to_lingo.json")
+    parser.add_argument('--delta', action='store_true',
+                        help='输出紧凑的增量格式：只包含非空的语言列和每个键的内容哈希')
+    parser.add_argument('--no-snapshot', dest='use_snapshot', action='store_false',
+                        help='不与上次从 Lingo 导入的数据比较，输出所有键')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='以 JSON Lines 格式输出到 new_to_lingo.jsonl（每行一个键）')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     try:
         print_step("开始", "开始转换翻译文件")
         
@@ -144,14 +260,24 @@ def main():
         # 读取翻译文件
         print_info("读取翻译文件...")
         zh_data, en_data = read_diff_json()
+        locale_data = read_locale_diffs(supported_languages)
         
-        # 转换数据
+        # 转换数据：逐条生成、筛选并写入，不在内存中保留完整列表
         print_info("转换数据格式...")
-        translations = convert_to_lingo_format(zh_data, en_data, supported_languages)
+        translations = iter_lingo_rows(zh_data, en_data, supported_languages, locale_data)
+
+        # 去掉 Lingo 中已有且内容相同的键
+        snapshot = load_lingo_snapshot(supported_languages) if args.use_snapshot else {}
+        translations = drop_unchanged(translations, snapshot)
+
+        if args.delta:
+            translations = to_delta_format(translations)
         
         # 保存结果
         print_info("保存转换后的数据...")
-        save_translations(translations)
+        count = save_translations(translations, jsonl=args.jsonl)
+        if len(zh_data) > count:
+            print_info(f"{len(zh_data) - count} 个键与 Lingo 中的内容一致，已跳过")
         
         print_success("转换完成")
     except Exception as e:
@@ -0,0 +1,92 @@
+"""
+功能模块键索引
+根据 as_i18n.yaml 中的 feature-strings 构建 ARB 键前缀的字典树，按键查找其所属的功能模块
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from config_utils import get_feature_strings
+
+# 字典树节点中保存功能名称的键，不会与单个字符冲突
+_OWNER = ''
+
+
+def to_arb_prefix(feature_prefix: str) -> str:
+    """
+    将 feature-strings 中的值转换为 ARB 文件中的键前缀
+
+    例如：app_strings -> appstrings_
+    """
+    return feature_prefix.replace('_', '') + '_'
+
+
+class FeaturePrefixIndex:
+    """
+    ARB 键前缀字典树
+
+    查找沿着键的字符逐层向下，耗时只与键的长度有关，与功能模块的数量无关。
+    多个前缀都能匹配时返回最长的前缀对应的功能；相同前缀以配置中先出现的功能为准。
+    """
+
+    def __init__(self, feature_strings: Mapping[str, str]):
+        self.prefixes: Dict[str, str] = {}
+        self._root: Dict[str, dict] = {}
+        for feature, feature_prefix in feature_strings.items():
+            prefix = to_arb_prefix(feature_prefix)
+            if prefix in self.prefixes:
+                continue
+            self.prefixes[prefix] = feature
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[_OWNER] = feature
+
+    @property
+    def features(self) -> List[str]:
+        return list(dict.fromkeys(self.prefixes.values()))
+
+    def owner(self, key: str) -> Optional[str]:
+        """返回键所属的功能名称，不属于任何功能时返回 None"""
+        node = self._root
+        owner = None
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            owner = node.get(_OWNER, owner)
+        return owner
+
+    def partition(self, keys: Iterable[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        按功能模块划分键
+
+        Returns:
+            Tuple[Dict[str, List[str]], List[str]]: (功能名称 -> 键列表, 不属于任何功能的键)
+        """
+        groups: Dict[str, List[str]] = {feature: [] for feature in self.features}
+        unowned: List[str] = []
+        for key in keys:
+            feature = self.owner(key)
+            if feature is None:
+                unowned.append(key)
+            else:
+                groups[feature].append(key)
+        return groups, unowned
+
+
+@lru_cache(maxsize=8)
+def _build_index(feature_items: Tuple[Tuple[str, str], ...]) -> FeaturePrefixIndex:
+    return FeaturePrefixIndex(dict(feature_items))
+
+
+def get_feature_index() -> FeaturePrefixIndex:
+    """
+    获取根据 feature-strings 配置构建的前缀索引
+
+    相同配置只构建一次，所有脚本共享同一个索引。
+
+    Raises:
+        KeyError: 如果配置中没有 feature-strings 字段
+    """
+    return _build_index(tuple(get_feature_strings().items()))
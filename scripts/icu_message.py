@@ -0,0 +1,163 @@
+"""
+ICU MessageFormat 解析模块
+提取 ARB 文案中的占位符签名（占位符名称 -> 参数类型），支持 plural / select / selectordinal 嵌套
+
+与 Flutter gen-l10n 的默认行为（use-escaping: false）一致，单引号不作为转义字符处理。
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# 需要解析分支子消息的参数类型
+BRANCH_TYPES = {'plural', 'select', 'selectordinal'}
+
+# 没有类型的简单占位符，例如 {name}
+SIMPLE_TYPE = 'simple'
+
+
+class ICUSyntaxError(ValueError):
+    """ICU 消息格式错误"""
+
+
+class _Parser:
+    """递归下降解析器，只收集参数名称和类型，不保留文本内容"""
+
+    def __init__(self, message: str):
+        self.message = message
+        self.length = len(message)
+        self.pos = 0
+        self.arguments: Dict[str, str] = {}
+
+    def parse(self) -> Dict[str, str]:
+        self._parse_message(nested=False)
+        return self.arguments
+
+    def _error(self, reason: str):
+        raise ICUSyntaxError(f"{reason}（位置 {self.pos}）")
+
+    def _skip_whitespace(self):
+        while self.pos < self.length and self.message[self.pos].isspace():
+            self.pos += 1
+
+    def _read_until(self, stops: str) -> str:
+        start = self.pos
+        while self.pos < self.length and self.message[self.pos] not in stops:
+            self.pos += 1
+        return self.message[start:self.pos]
+
+    def _parse_message(self, nested: bool):
+        """解析文本和参数，nested 为 True 时遇到未配对的 '}' 结束（由调用方消费）"""
+        while self.pos < self.length:
+            char = self.message[self.pos]
+            if char == '{':
+                self.pos += 1
+                self._parse_argument()
+            elif char == '}':
+                if nested:
+                    return
+                self._error("多余的 '}'")
+            else:
+                self.pos += 1
+        if nested:
+            self._error("缺少 '}'")
+
+    def _parse_argument(self):
+        """解析 '{' 之后的参数，直到与之配对的 '}'"""
+        self._skip_whitespace()
+        name = self._read_until(',}{').strip()
+        if self.pos >= self.length:
+            self._error("参数缺少 '}'")
+        if not name:
+            self._error("参数名称为空")
+        if self.message[self.pos] == '{':
+            self._error(f"参数 {name} 中出现了意外的 '{{'")
+
+        if self.message[self.pos] == '}':
+            self.pos += 1
+            self._add_argument(name, SIMPLE_TYPE)
+            return
+
+        # 跳过 ','，读取参数类型
+        self.pos += 1
+        self._skip_whitespace()
+        arg_type = self._read_until(',}{').strip()
+        if self.pos >= self.length:
+            self._error(f"参数 {name} 缺少 '}}'")
+        if not arg_type:
+            self._error(f"参数 {name} 的类型为空")
+        self._add_argument(name, arg_type)
+
+        if arg_type in BRANCH_TYPES:
+            if self.message[self.pos] != ',':
+                self._error(f"{arg_type} 参数 {name} 缺少分支")
+            self.pos += 1
+            self._parse_branches(name, arg_type)
+        else:
+            # number / date / time 等类型可以带格式参数，直接跳到配对的 '}'
+            self._skip_style()
+
+    def _parse_branches(self, name: str, arg_type: str):
+        """解析 plural / select 的分支，例如 =0{...} one{...} other{...}"""
+        has_branch = False
+        while True:
+            self._skip_whitespace()
+            if self.pos >= self.length:
+                self._error(f"{arg_type} 参数 {name} 缺少 '}}'")
+            char = self.message[self.pos]
+            if char == '}':
+                self.pos += 1
+                break
+            selector = self._read_until('{} \t\r\n')
+            self._skip_whitespace()
+            if selector.startswith('offset:') and not selector[len('offset:'):]:
+                # 形如 "offset: 1" 的写法
+                self._read_until('{} \t\r\n')
+                continue
+            if selector.startswith('offset:'):
+                continue
+            if self.pos >= self.length or self.message[self.pos] != '{':
+                self._error(f"{arg_type} 参数 {name} 的分支 {selector} 缺少内容")
+            self.pos += 1
+            self._parse_message(nested=True)
+            self.pos += 1  # 消费分支结尾的 '}'
+            has_branch = True
+        if not has_branch:
+            self._error(f"{arg_type} 参数 {name} 没有任何分支")
+
+    def _skip_style(self):
+        depth = 0
+        while self.pos < self.length:
+            char = self.message[self.pos]
+            self.pos += 1
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                if depth == 0:
+                    return
+                depth -= 1
+        self._error("参数缺少 '}'")
+
+    def _add_argument(self, name: str, arg_type: str):
+        # 同名参数在多个分支中重复出现时，以带类型的写法为准
+        if self.arguments.get(name, SIMPLE_TYPE) == SIMPLE_TYPE:
+            self.arguments[name] = arg_type
+
+
+@lru_cache(maxsize=65536)
+def parse_signature(message: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    解析 ICU 消息，返回排序后的 (占位符名称, 类型) 元组
+
+    结果按消息文本缓存，多种语言中相同的文案只解析一次。
+
+    Raises:
+        ICUSyntaxError: 如果括号不配对或 plural/select 格式错误
+    """
+    if '{' not in message and '}' not in message:
+        return ()
+    return tuple(sorted(_Parser(message).parse().items()))
+
+
+def placeholder_names(signature: Tuple[Tuple[str, str], ...]) -> Tuple[str, ...]:
+    """签名中的占位符名称"""
+    return tuple(name for name, _ in signature)
@@ -1,16 +1,15 @@
+import argparse
+import http.client
 import os
-import re
-import ast
-import json
 import subprocess
-import shutil
-from config_utils import get_lingo_prefix, get_locales, get_project_root
+from concurrent.futures import ProcessPoolExecutor
+from config_utils import get_lingo_prefix, get_locales, get_project_locale, get_project_root
+import json_codec
 from print_utils import print_step, print_info, print_success, print_error
-
-def ensure_temp_dir():
-    temp_dir = os.path.join('build', 'localizations', 'lingo_to_arb')
-    os.makedirs(temp_dir, exist_ok=True)
-    return temp_dir
+from lingo_js_parser import LingoParseError, iter_lingo_entries
+from lingo_snapshot import SNAPSHOT_PATH, LingoSnapshot, apply_delta, diff_arb, print_delta_summary
+from lingo_client import (LingoClientError, fetch_lingo_data, load_lingo_file_config,
+                          load_records_file, replace_all, sync_language_files)
 
 def check_lingo_installed():
     """检查 lingo-sync 目录下是否安装了 lingo CLI"""
@@ -81,58 +80,19 @@ def run_lingo_command():
         print_error(f"执行 Lingo 命令失败: {e}")
         exit(1)
 
-def process_locale_file(file_path, language, temp_dir, prefix):
-    # 读取JS文件内容
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 匹配 let json = { ... } export default json
-    match = re.search(r'let json = (\{[\s\S]*?\})\s*export default json', content)
-    if not match:
-        print_error(f"无法在文件 {file_path} 中找到JSON对象")
-        return
-    
-    obj_str = match.group(1)
-    
-    # 保存所有URL
-    urls = {}
-    url_count = 0
-    def save_url(match):
-        nonlocal url_count
-        url = match.group(0)
-        placeholder = f"__URL_PLACEHOLDER_{url_count}__"
-        urls[placeholder] = url
-        url_count += 1
-        return placeholder
-
-    # 临时替换URL
-    obj_str = re.sub(r'"https?://[^"]*"', save_url, obj_str)
-    
-    # 清理JS对象字符串，使其成为有效的JSON
-    obj_str = re.sub(r'//.*?\n', '\n', obj_str)  # 移除注释
-    obj_str = re.sub(r',\s*}', '}', obj_str)     # 兼容尾逗号
-    obj_str = re.sub(r',\s*]', ']', obj_str)     # 移除数组中的尾随逗号
-    
-    # 还原URL
-    for placeholder, url in urls.items():
-        obj_str = obj_str.replace(placeholder, url)
-    
+def process_locale_file(file_path, language, prefix):
+    """
+    解析语言文件中 // lingo-start 与 // lingo-end 之间的翻译，返回 ARB 数据
+
+    逐行扫描文件，扫描时按 prefix 筛选并移除前缀，解析失败时返回 None
+    """
     try:
-        # 将JS对象转换为Python字典
-        data = ast.literal_eval(obj_str)
-    except Exception as e:
-        print_error(f"解析JS对象时出错 {file_path}: {e}")
-        print_error(f"问题字符串: {obj_str}")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            filtered_data = dict(iter_lingo_entries(f, prefix))
+    except LingoParseError as e:
+        print_error(f"解析语言文件 {file_path} 时出错: {e}")
         return
     
-    # 用prefix筛选
-    filtered_data = {}
-    for key, value in data.items():
-        if key.startswith(prefix):
-            # 移除前缀
-            new_key = key[len(prefix):]
-            filtered_data[new_key] = value
-    
     # 添加locale信息
     result = {
         "@@locale": language,
@@ -141,41 +101,55 @@ def process_locale_file(file_path, language, temp_dir, prefix):
     
     return result
 
-def convert_and_copy_files(temp_dir):
-    # 转换 zh_CN 到 zh_Hans_CN
-    zh_cn_path = os.path.join(temp_dir, 'intl_zh_CN.arb')
-    if os.path.exists(zh_cn_path):
-        with open(zh_cn_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        data['@@locale'] = 'zh_Hans_CN'
-        with open(os.path.join(temp_dir, 'intl_zh_Hans_CN.arb'), 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        # 删除原始文件
-        os.remove(zh_cn_path)
-        print_info("已删除 intl_zh_CN.arb")
-    
-    # 转换 zh_HK 到 zh_Hant_HK 和 zh_Hant_TW
-    zh_hk_path = os.path.join(temp_dir, 'intl_zh_HK.arb')
-    if os.path.exists(zh_hk_path):
-        with open(zh_hk_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 创建 zh_Hant_HK
-        data_hk = data.copy()
-        data_hk['@@locale'] = 'zh_Hant_HK'
-        with open(os.path.join(temp_dir, 'intl_zh_Hant_HK.arb'), 'w', encoding='utf-8') as f:
-            json.dump(data_hk, f, ensure_ascii=False, indent=2)
-        
-        # 删除原始文件
-        os.remove(zh_hk_path)
-        print_success("已删除 intl_zh_HK.arb")
-
-def copy_to_translations(temp_dir):
-    # 获取项目根目录
-    project_root = get_project_root()
-    translations_dir = os.path.join(project_root, 'assets', 'translations')
+def write_arb_file(file_path, data):
+    """先写临时文件再重命名，避免中断时留下不完整的 ARB 文件"""
+    temp_path = f"{file_path}.tmp"
+    try:
+        json_codec.write_file(temp_path, data)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def import_locale_file(file_path, locale, prefix, translations_dir):
+    """
+    解析一个语言文件并直接写入 assets/translations（在进程池中执行）
+
+    Returns:
+        int: 写入的翻译条数，解析失败时返回 None
+    """
+    result = process_locale_file(file_path, locale, prefix)
+    if result is None:
+        return None
+    write_arb_file(os.path.join(translations_dir, f"intl_{locale}.arb"), result)
+    return len(result) - 1
+
+def collect_locale_jobs(locales_dir, declared_locales):
+    """
+    列出需要导入的语言文件
+
+    Lingo 语言代码在这里转换为项目语言代码（zh_CN -> zh_Hans_CN，zh_HK -> zh_Hant_HK），
+    未在 as_i18n.yaml 中声明的语言不会被解析。
+
+    Returns:
+        List[Tuple[str, str]]: (语言文件路径, 项目语言代码)
+    """
+    jobs = []
+    for filename in sorted(os.listdir(locales_dir)):
+        if not filename.endswith('.js'):
+            continue
+        locale = get_project_locale(filename[:-len('.js')])
+        if locale not in declared_locales:
+            print_info(f"跳过 {filename}，{locale} 未在 as_i18n.yaml 中声明")
+            continue
+        jobs.append((os.path.join(locales_dir, filename), locale))
+    return jobs
+
+def import_locale_files(locales_dir, prefix, max_workers=None):
+    """并行解析所有语言文件，每个 ARB 文件只写入一次"""
+    translations_dir = os.path.join(get_project_root(), 'assets', 'translations')
     os.makedirs(translations_dir, exist_ok=True)
-    
+
     # 读取声明的语言列表
     try:
         declared_locales = get_locales()
@@ -183,26 +157,138 @@ def copy_to_translations(temp_dir):
     except Exception as e:
         print_error(f"读取 as_i18n.yaml 文件失败: {e}")
         return
-    
-    # 复制指定语言的 arb 文件到目标目录
-    copied_count = 0
-    for filename in os.listdir(temp_dir):
-        if filename.startswith('intl_') and filename.endswith('.arb'):
-            # 从文件名中提取语言代码
-            locale = filename.replace('intl_', '').replace('.arb', '')
-            
-            # 检查是否在声明的语言列表中
-            if locale in declared_locales:
-                shutil.copy2(
-                    os.path.join(temp_dir, filename),
-                    os.path.join(translations_dir, filename)
-                )
-                print_success(f"已拷贝 {filename} 到主项目")
-                copied_count += 1
-            else:
-                print_info(f"跳过 {filename}，未在 as_i18n.yaml 中声明")
-
-    print_info(f"总共拷贝了 {copied_count} 个语言文件")
+
+    jobs = collect_locale_jobs(locales_dir, declared_locales)
+    if not jobs:
+        print_info("没有需要导入的语言文件")
+        return
+
+    file_paths = [file_path for file_path, _ in jobs]
+    locales = [locale for _, locale in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        counts = list(executor.map(import_locale_file, file_paths, locales,
+                                   [prefix] * len(jobs), [translations_dir] * len(jobs)))
+
+    imported_count = 0
+    for locale, count in zip(locales, counts):
+        if count is None:
+            print_error(f"intl_{locale}.arb 未更新")
+            continue
+        print_success(f"已写入 intl_{locale}.arb（{count} 条）")
+        imported_count += 1
+
+    print_info(f"总共导入了 {imported_count} 个语言文件")
+
+def lingo_data_to_arb(data, lingo_config, prefix, declared_locales):
+    """
+    把 Lingo 数据直接转换为各语言的 ARB 数据
+
+    键先按 lingoconfig.json 的 keyReplaces 替换（与写入 JS 语言文件时一致），再按 prefix 筛选并移除前缀；
+    Lingo 语言代码转换为项目语言代码，未在 as_i18n.yaml 中声明的语言会被跳过。值保持接口返回的原文，
+    不经过 valueReplaces（那是写 JS 文件时的转义）。
+
+    Returns:
+        Dict[str, dict]: 项目语言代码 -> ARB 数据
+    """
+    key_replaces = lingo_config.get('keyReplaces')
+    # 同一个键在每种语言中都会出现，替换和筛选的结果只计算一次；None 表示不属于该前缀
+    arb_keys = {}
+
+    def arb_key(key):
+        if key not in arb_keys:
+            replaced = replace_all(key, key_replaces)
+            arb_keys[key] = replaced[len(prefix):] if replaced.startswith(prefix) else None
+        return arb_keys[key]
+
+    result = {}
+    for code, translations in data.languages.items():
+        locale = get_project_locale(code)
+        if locale not in declared_locales:
+            print_info(f"跳过 {code}，{locale} 未在 as_i18n.yaml 中声明")
+            continue
+        arb_data = {"@@locale": locale}
+        for key, value in translations.items():
+            name = arb_key(key)
+            if name is not None:
+                arb_data[name] = value
+        result[locale] = arb_data
+    return result
+
+def load_existing_arb(file_path):
+    """读取现有的 ARB 文件，不存在或无法解析时返回 None"""
+    if not os.path.exists(file_path):
+        return None
+    try:
+        return json_codec.load_file(file_path)
+    except (OSError, ValueError) as e:
+        print_error(f"读取 {file_path} 时出错，将整体写入: {e}")
+        return None
+
+def import_lingo_data(data, lingo_config, prefix, full=False):
+    """
+    将 Lingo 数据直接写入 assets/translations，不经过 lingo-sync 中的 JS 语言文件
+
+    ARB 文件已存在时与现有内容比较，只更新变化的条目（新增、修改、删除），其余条目保持不变；
+    ARB 文件不存在、无法解析或者 full 为 True 时整体写入。
+    写入完成后更新快照（供 diff_to_lingo.py 使用）。
+    """
+    translations_dir = os.path.join(get_project_root(), 'assets', 'translations')
+    os.makedirs(translations_dir, exist_ok=True)
+
+    declared_locales = get_locales()
+    arb_files = lingo_data_to_arb(data, lingo_config, prefix, declared_locales)
+    for locale in declared_locales:
+        if locale not in arb_files:
+            print_info(f"Lingo 数据中没有 {locale} 的翻译，intl_{locale}.arb 保持不变")
+
+    deltas = {}
+    for locale, arb_data in sorted(arb_files.items()):
+        arb_path = os.path.join(translations_dir, f"intl_{locale}.arb")
+        existing = None if full else load_existing_arb(arb_path)
+        if existing is None:
+            write_arb_file(arb_path, arb_data)
+            print_success(f"已写入 intl_{locale}.arb（{len(arb_data) - 1} 条）")
+            continue
+
+        delta = diff_arb(existing, arb_data)
+        deltas[locale] = delta
+        if not delta.is_empty():
+            write_arb_file(arb_path, apply_delta(existing, delta))
+
+    if deltas:
+        print_step("DELTA", "与现有 ARB 文件相比的变化")
+        print_delta_summary(deltas)
+
+    snapshot_path = os.path.join(get_project_root(), SNAPSHOT_PATH)
+    (LingoSnapshot.load(snapshot_path) or LingoSnapshot()).merged(arb_files).save(snapshot_path)
+    changed_count = sum(1 for delta in deltas.values() if not delta.is_empty())
+    print_info(f"总共导入了 {len(arb_files)} 个语言文件，其中 {len(arb_files) - len(deltas)} 个整体写入、"
+               f"{changed_count} 个增量更新")
+
+def import_direct(records_file=None, full=False):
+    """
+    直接模式：从 Lingo 接口（或保存的 data.records 数据）一次写入 ARB
+
+    Args:
+        records_file: 保存的接口响应或 records 数组文件，为 None 时请求 Lingo 接口
+        full: 不与现有 ARB 文件比较，整体写入所有 ARB 文件
+    """
+    prefix = get_lingo_prefix()
+    try:
+        lingo_config = load_lingo_file_config()
+        if records_file:
+            resources = lingo_config.get('resources') or [{}]
+            data = load_records_file(records_file, resources[0].get('dataPath') or 'data.records')
+            print_info(f"从 {records_file} 读取到 {data.record_count} 条翻译")
+        else:
+            data = fetch_lingo_data(lingo_config)
+            print_info(f"拉取了 {data.fetched_pages} 页、{data.record_count} 条翻译"
+                       f"（{data.cached_pages} 页未变化，使用缓存）")
+    except (LingoClientError, OSError, http.client.HTTPException) as e:
+        print_error(f"读取灵果翻译失败: {e}")
+        exit(1)
+
+    import_lingo_data(data, lingo_config, prefix, full)
 
 def check_and_create_locale_files():
     # 获取脚本文件所在目录的上级目录，然后找到 lingo-sync 文件夹
@@ -224,43 +310,52 @@ def check_and_create_locale_files():
             with open(js_file_path, 'w', encoding='utf-8') as f:
                 f.write('let json = {\n// lingo-start\n// lingo-end\n}\nexport default json\n')
 
-def main():
-    # 创建临时目录
-    temp_dir = ensure_temp_dir()
+def pull_lingo_translations():
+    """用 Python 版 Lingo 客户端拉取翻译并更新语言文件"""
+    try:
+        sync_language_files()
+    except (LingoClientError, OSError, http.client.HTTPException) as e:
+        print_error(f"拉取灵果翻译失败: {e}")
+        exit(1)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="从灵果拉取翻译并导入 assets/translations")
+    parser.add_argument('--node', action='store_true',
+                        help='使用 lingo-sync 中的 Node 版 lingo 命令拉取（需要 npm install）')
+    parser.add_argument('--direct', action='store_true',
+                        help='直接把 Lingo 接口数据写入 ARB，不经过 lingo-sync/src/locales 下的 JS 语言文件')
+    parser.add_argument('--records', metavar='FILE',
+                        help='直接模式下使用保存的接口响应或 data.records 数组，不请求 Lingo 接口（隐含 --direct）')
+    parser.add_argument('--full', action='store_true',
+                        help='直接模式下不与现有 ARB 文件比较，整体写入所有 ARB 文件')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.direct or args.records:
+        print_info("开始导入灵果翻译（直接模式）")
+        import_direct(args.records, args.full)
+        print_success("所有处理完成！")
+        return
+
     # 读取prefix
     prefix = get_lingo_prefix()
     # 1. 检查并创建缺失的语言文件
     check_and_create_locale_files()
     
-    # 2. 运行 lingo 命令
+    # 2. 拉取灵果翻译并写入语言文件
     print_info("开始拉取灵果翻译")
-    run_lingo_command()
+    if args.node:
+        run_lingo_command()
+    else:
+        pull_lingo_translations()
     
-    # 3. 处理语言文件
+    # 3. 并行处理语言文件，直接写入 translations 目录
     # 获取脚本文件所在目录的上级目录，然后找到 lingo-sync 文件夹
     script_dir = os.path.dirname(os.path.abspath(__file__))
     parent_dir = os.path.dirname(script_dir)
     locales_dir = os.path.join(parent_dir, 'lingo-sync', 'src', 'locales')
-    
-    # 遍历所有JS文件
-    for filename in os.listdir(locales_dir):
-        if filename.endswith('.js'):
-            # 从文件名中提取语言代码
-            language = filename.replace('.js', '')
-            file_path = os.path.join(locales_dir, filename)
-            result = process_locale_file(file_path, language, temp_dir, prefix)
-            
-            if result:
-                # 写入ARB文件
-                output_file = os.path.join(temp_dir, f"intl_{language}.arb")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-
-    # 4. 转换和复制文件
-    convert_and_copy_files(temp_dir)
-    
-    # 5. 复制到 translations 目录
-    copy_to_translations(temp_dir)
+    import_locale_files(locales_dir, prefix)
 
     print_success("所有处理完成！")
 
@@ -0,0 +1,152 @@
+"""
+JSON 编解码模块
+安装了 orjson 时使用 orjson，否则使用标准库 json；两种实现的格式化输出逐字节一致
+
+格式化输出与 json.dumps(data, ensure_ascii=False, indent=2) 相同。orjson 无法编码或者编码结果
+与标准库不同的数据（超过 64 位的整数、非字符串的键、NaN 和 Infinity 等）会自动退回标准库。
+孤立的代理字符无法编码为 UTF-8，dumps_bytes 和 write_file 会抛出 UnicodeEncodeError。
+注意 orjson 会把超过 64 位的整数解析为浮点数，翻译数据中不会出现这种值。
+设置环境变量 AS_I18N_JSON_BACKEND=json 可以强制使用标准库。
+"""
+
+import json
+import math
+import os
+import re
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+if os.environ.get('AS_I18N_JSON_BACKEND') == 'json':
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# 格式化输出中以浮点数为值的行。字符串中不会出现原始换行，所以按行匹配不会误伤字符串内容
+_FLOAT_LINE = re.compile(
+    r'^(\s*(?:"(?:[^"\\\n]|\\.)*": )?)(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)(,?)$'.encode('ascii'),
+    re.MULTILINE,
+)
+
+
+_CONTAINER_TYPES = (dict, list, tuple)
+
+
+def _has_float(data: Any) -> bool:
+    """
+    数据中是否包含浮点数
+
+    每层只用 map(type, ...) 收集类型集合，只递归进入容器，ARB 这类扁平的字符串字典只需一次集合运算。
+    """
+    if isinstance(data, float):
+        return True
+    if isinstance(data, dict):
+        values = data.values()
+    elif isinstance(data, (list, tuple)):
+        values = data
+    else:
+        return False
+    types = set(map(type, values))
+    if float in types:
+        return True
+    if not types.intersection(_CONTAINER_TYPES) and not any(issubclass(t, _CONTAINER_TYPES) for t in types):
+        return False
+    return any(_has_float(value) for value in values if isinstance(value, _CONTAINER_TYPES))
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """数据中是否包含 NaN 或 Infinity（orjson 会把它们输出为 null，标准库输出 NaN / Infinity）"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in data)
+    return False
+
+
+def _normalize_float(match) -> bytes:
+    number = match.group(2)
+    if b'.' not in number and b'e' not in number and b'E' not in number:
+        return match.group(0)
+    # orjson 和标准库都输出最短的往返表示，只有指数形式不同（1e16 与 1e+16），统一为 repr 的格式
+    return match.group(1) + repr(float(number)).encode('ascii') + match.group(3)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    解析 JSON 字符串或字节串
+
+    Raises:
+        json.JSONDecodeError: 如果不是有效的 JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # 交给标准库处理（例如 NaN），真正的格式错误也由标准库抛出同样的异常
+            pass
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def load_file(file_path: str) -> Any:
+    """读取并解析 JSON 文件"""
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
+
+
+def _orjson_dumps(data: Any) -> Optional[bytes]:
+    """用 orjson 格式化输出，没有安装 orjson 或者结果会与标准库不同时返回 None"""
+    if orjson is None:
+        return None
+    try:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    except TypeError:
+        # orjson.JSONEncodeError 是 TypeError 的子类
+        return None
+    if _has_float(data):
+        if _has_non_finite_float(data):
+            return None
+        encoded = _FLOAT_LINE.sub(_normalize_float, encoded)
+    return encoded
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """
+    格式化输出为 UTF-8 字节串（两空格缩进，不转义非 ASCII 字符，末尾不带换行）
+
+    写文件时优先使用该函数，orjson 的输出本身就是字节串，可以省去一次解码。
+
+    Raises:
+        UnicodeEncodeError: 如果字符串中包含孤立的代理字符
+    """
+    encoded = _orjson_dumps(data)
+    if encoded is not None:
+        return encoded
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def dumps(data: Any) -> str:
+    """格式化输出（两空格缩进，不转义非 ASCII 字符，末尾不带换行）"""
+    encoded = _orjson_dumps(data)
+    if encoded is not None:
+        return encoded.decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def write_file(file_path: str, data: Any, trailing_newline: bool = False):
+    """将数据格式化写入文件（非原子写入，需要原子替换时由调用方写临时文件再重命名）"""
+    encoded = dumps_bytes(data)
+    with open(file_path, 'wb') as f:
+        f.write(encoded + b'\n' if trailing_newline else encoded)
+
+
+def dumps_compact(data: Any) -> str:
+    """单行输出，用于 JSON Lines；与 json.dumps(data, ensure_ascii=False) 一致"""
+    # orjson 的紧凑格式没有分隔符后的空格，为保持文件格式不变这里始终使用标准库
+    return json.dumps(data, ensure_ascii=False)
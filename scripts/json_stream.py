@@ -0,0 +1,274 @@
+"""
+流式 JSON 读写模块
+逐条写入记录，支持 JSON 数组、JSON 对象和 JSON Lines 三种格式，写完后通过临时文件重命名原子地替换目标文件；
+读取时按路径逐个解析 JSON 文档中某个数组的元素，不需要先把整个文档读入内存
+
+数组和对象格式的输出与 json.dump(data, f, ensure_ascii=False, indent=2) 逐字节一致。
+"""
+
+import codecs
+import json
+import os
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Tuple
+
+import json_codec
+
+FORMAT_ARRAY = 'array'
+FORMAT_OBJECT = 'object'
+FORMAT_JSONL = 'jsonl'
+FORMATS = (FORMAT_ARRAY, FORMAT_OBJECT, FORMAT_JSONL)
+
+_OPENERS = {FORMAT_ARRAY: (b'[', b']'), FORMAT_OBJECT: (b'{', b'}')}
+
+# 与 json_codec 的格式化输出一致的缩进
+INDENT = b'  '
+
+
+class JsonStreamWriter:
+    """
+    流式 JSON 写入器
+
+    用作上下文管理器：正常退出时补全结尾并重命名为目标文件，发生异常时删除临时文件，
+    目标文件保持原样。内存中只保留当前正在写入的一条记录。
+
+    用法:
+        with JsonStreamWriter(path, FORMAT_ARRAY) as writer:
+            for record in records:
+                writer.write(record)
+    """
+
+    def __init__(self, file_path: str, format: str = FORMAT_ARRAY, trailing_newline: bool = False):
+        if format not in FORMATS:
+            raise ValueError(f"不支持的输出格式: {format}")
+        self.file_path = file_path
+        self.temp_path = f"{file_path}.tmp"
+        self.format = format
+        self.trailing_newline = trailing_newline
+        self.count = 0
+        self.file = None
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        self.file = open(self.temp_path, 'wb')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._finish()
+            os.replace(self.temp_path, self.file_path)
+        else:
+            self.file.close()
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+        return False
+
+    def _finish(self):
+        if self.format in _OPENERS:
+            opener, closer = _OPENERS[self.format]
+            self.file.write(b'\n' + closer if self.count else opener + closer)
+            if self.trailing_newline:
+                self.file.write(b'\n')
+        self.file.close()
+
+    def _separator(self):
+        """数组和对象格式在每条记录前写入开括号或逗号"""
+        if self.count == 0:
+            self.file.write(_OPENERS[self.format][0] + b'\n')
+        else:
+            self.file.write(b',\n')
+
+    def _indented(self, value: Any) -> bytes:
+        # 多行的 JSON 中字符串不会包含原始换行，所以可以直接按行缩进
+        return json_codec.dumps_bytes(value).replace(b'\n', b'\n' + INDENT)
+
+    def write(self, record: Any):
+        """写入一条数组元素或 JSON Lines 记录"""
+        if self.format == FORMAT_OBJECT:
+            raise ValueError("对象格式请使用 write_item 写入键值对")
+        if self.format == FORMAT_JSONL:
+            self.file.write(json_codec.dumps_compact(record).encode('utf-8') + b'\n')
+        else:
+            self._separator()
+            self.file.write(INDENT + self._indented(record))
+        self.count += 1
+
+    def write_item(self, key: str, value: Any):
+        """写入一个对象成员；JSON Lines 格式下写为 {key: value} 一行"""
+        if self.format == FORMAT_ARRAY:
+            raise ValueError("数组格式请使用 write 写入记录")
+        if self.format == FORMAT_JSONL:
+            self.write({key: value})
+            return
+        self._separator()
+        self.file.write(INDENT + json_codec.dumps_bytes(key) + b': ' + self._indented(value))
+        self.count += 1
+
+
+def write_json_records(file_path: str, records: Iterable[Any], format: str = FORMAT_ARRAY,
+                       trailing_newline: bool = False) -> int:
+    """
+    将记录逐条写入 JSON 数组或 JSON Lines 文件
+
+    Returns:
+        int: 写入的记录数
+    """
+    with JsonStreamWriter(file_path, format, trailing_newline=trailing_newline) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+def write_json_items(file_path: str, items: Iterable[Tuple[str, Any]], trailing_newline: bool = False) -> int:
+    """
+    将键值对逐个写入 JSON 对象文件
+
+    Returns:
+        int: 写入的键数
+    """
+    with JsonStreamWriter(file_path, FORMAT_OBJECT, trailing_newline=trailing_newline) as writer:
+        for key, value in items:
+            writer.write_item(key, value)
+    return writer.count
+
+
+# 每次从输入流读取的字节数
+READ_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _JsonStreamReader:
+    """
+    从二进制流中按需读取并解析 JSON 值
+
+    缓冲区中只保留尚未解析的部分。单个值用标准库的 raw_decode 解析，值不完整时继续读取后重新解析；
+    每次追加的数据量不少于缓冲区中尚未解析的部分，因此很大的值也只会被重新解析对数次，
+    总的解析时间与输入大小成线性关系。
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = READ_CHUNK_SIZE) -> bool:
+        """至少读取 size 字节（输入结束时除外）追加到缓冲区，输入已经结束时返回 False"""
+        if self.eof:
+            return False
+        chunks = []
+        remaining = max(size, READ_CHUNK_SIZE)
+        while remaining > 0:
+            chunk = self.stream.read(remaining)
+            if not chunk:
+                self.eof = True
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(b''.join(chunks), final=self.eof)
+        self.pos = 0
+        return True
+
+    def _error(self, message: str):
+        raise json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """跳过空白，返回下一个字符（不消耗），输入结束时返回空字符串"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            self._error(f"期望 {char!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """解析下一个完整的 JSON 值"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            # 数字可能在缓冲区末尾被截断（例如 12 后面还有 3），需要确认后面还有其他字符
+            if end == len(self.buffer) and not self.eof:
+                self._fill(len(self.buffer) - self.pos)
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_object_path(reader: _JsonStreamReader, path: Tuple[str, ...], prefix: Tuple[str, ...],
+                      others: Dict[str, Any]) -> Iterator[Any]:
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            reader._error("对象的键必须是字符串")
+        reader.expect(':')
+        current = prefix + (key,)
+        depth = len(prefix)
+        next_char = reader.peek()
+        if key == path[depth] and depth == len(path) - 1 and next_char == '[':
+            yield from _iter_array_items(reader)
+        elif key == path[depth] and depth < len(path) - 1 and next_char == '{':
+            yield from _iter_object_path(reader, path, current, others)
+        else:
+            others['.'.join(current)] = reader.value()
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            reader.pos -= 1
+            reader._error("期望 ',' 或 '}'")
+
+
+def _iter_array_items(reader: _JsonStreamReader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            reader.pos -= 1
+            reader._error("期望 ',' 或 ']'")
+
+
+def iter_json_path(stream: BinaryIO, path: str, others: Dict[str, Any] = None) -> Iterator[Any]:
+    """
+    逐个解析 JSON 文档中 path 指向的数组的元素
+
+    path 用点号分隔对象的键，例如 "data.records"。路径以外的值会完整解析后以带点号的路径
+    为键放入 others（例如 others["code"]、others["data.total"]），它们可能出现在数组之后，
+    所以要在生成器耗尽后再读取。路径不存在或者不是数组时不会产生任何元素。
+
+    Raises:
+        json.JSONDecodeError: 如果输入不是有效的 JSON
+    """
+    others = {} if others is None else others
+    reader = _JsonStreamReader(stream)
+    if reader.peek() != '{':
+        others[''] = reader.value()
+    else:
+        yield from _iter_object_path(reader, tuple(path.split('.')), (), others)
+    if reader.peek():
+        reader._error("JSON 文档之后存在多余的内容")
@@ -0,0 +1,157 @@
+"""
+翻译键索引模块
+为每个翻译键分配整数 ID，并用位图记录每种语言包含哪些键，用于计算多语言的覆盖矩阵
+"""
+
+import csv
+from typing import Dict, Iterable, List, Optional
+
+import json_codec
+
+
+def popcount(mask: int) -> int:
+    """统计位图中置位的数量"""
+    if hasattr(mask, 'bit_count'):
+        return mask.bit_count()
+    return bin(mask).count('1')
+
+
+class KeyIndex:
+    """
+    翻译键驻留表
+
+    每个键只保存一次，并分配一个从 0 开始递增的整数 ID，位图的第 i 位对应 ID 为 i 的键。
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.ids: Dict[str, int] = {}
+        self.keys: List[str] = []
+        for key in keys:
+            self.intern(key)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def intern(self, key: str) -> int:
+        """获取键的 ID，不存在时分配新 ID"""
+        key_id = self.ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            self.ids[key] = key_id
+            self.keys.append(key)
+        return key_id
+
+    def mask(self, keys: Iterable[str]) -> int:
+        """将键集合转换为位图，未出现过的键会被驻留"""
+        # 先在字节数组中置位再一次性转换为整数，避免逐个对大整数做或运算
+        ids = [self.intern(key) for key in keys]
+        if not ids:
+            return 0
+        bits = bytearray(max(ids) // 8 + 1)
+        for key_id in ids:
+            bits[key_id >> 3] |= 1 << (key_id & 7)
+        return int.from_bytes(bits, 'little')
+
+    def full_mask(self) -> int:
+        """包含所有已驻留键的位图"""
+        return (1 << len(self.keys)) - 1
+
+    def iter_ids(self, mask: int) -> Iterable[int]:
+        """按 ID 升序遍历位图中置位的 ID"""
+        # 反转后的二进制字符串中第 i 个字符对应第 i 位
+        bits = bin(mask)[:1:-1]
+        position = bits.find('1')
+        while position != -1:
+            yield position
+            position = bits.find('1', position + 1)
+
+    def keys_from_mask(self, mask: int) -> List[str]:
+        """将位图转换回键列表（按 ID 顺序）"""
+        return [self.keys[key_id] for key_id in self.iter_ids(mask)]
+
+
+class CoverageMatrix:
+    """
+    语言 × 键 的覆盖矩阵
+
+    每种语言只保存一个位图，5 万个键 × 40 种语言约占 250KB。
+    """
+
+    def __init__(self, index: Optional[KeyIndex] = None):
+        self.index = index if index is not None else KeyIndex()
+        self.masks: Dict[str, int] = {}
+
+    @property
+    def locales(self) -> List[str]:
+        return list(self.masks)
+
+    def add(self, locale: str, keys: Iterable[str]):
+        """记录某种语言包含的键"""
+        self.masks[locale] = self.masks.get(locale, 0) | self.index.mask(keys)
+
+    def union_mask(self) -> int:
+        """所有语言中出现过的键"""
+        mask = 0
+        for locale_mask in self.masks.values():
+            mask |= locale_mask
+        return mask
+
+    def missing_mask(self, locale: str, reference_mask: Optional[int] = None) -> int:
+        """相对于 reference_mask（默认为所有语言的并集）缺失的键位图"""
+        if reference_mask is None:
+            reference_mask = self.union_mask()
+        return reference_mask & ~self.masks.get(locale, 0)
+
+    def missing_keys(self, locale: str, reference_mask: Optional[int] = None) -> List[str]:
+        """某种语言缺失的键（按 ID 顺序）"""
+        return self.index.keys_from_mask(self.missing_mask(locale, reference_mask))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        每种语言的覆盖统计
+
+        Returns:
+            Dict[str, Dict[str, float]]: 语言 -> {"present", "missing", "completion"}
+        """
+        union = self.union_mask()
+        total = popcount(union)
+        result = {}
+        for locale, mask in self.masks.items():
+            present = popcount(mask & union)
+            result[locale] = {
+                'present': present,
+                'missing': total - present,
+                'completion': present / total if total else 1.0,
+            }
+        return result
+
+    def export_json(self, output_path: str):
+        """
+        导出 JSON 格式的覆盖矩阵
+
+        矩阵按语言保存缺失键列表，而不是完整的 0/1 表格，文件大小与缺失数量成正比。
+        """
+        union = self.union_mask()
+        data = {
+            'total_keys': popcount(union),
+            'locales': {
+                locale: {**stats, 'missing_keys': self.missing_keys(locale, union)}
+                for locale, stats in self.summary().items()
+            },
+        }
+        json_codec.write_file(output_path, data)
+
+    def export_csv(self, output_path: str):
+        """导出 CSV 格式的覆盖矩阵：每行一个键，每列一种语言，1 表示存在"""
+        locales = self.locales
+        size = len(self.index)
+        # 每种语言的位图先展开成 '0'/'1' 字符串，避免对大整数逐位移位
+        columns = [bin(self.masks[locale])[:1:-1].ljust(size, '0') for locale in locales]
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['key', *locales])
+            for key_id in self.index.iter_ids(self.union_mask()):
+                writer.writerow([self.index.keys[key_id], *(column[key_id] for column in columns)])
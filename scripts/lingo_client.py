@@ -0,0 +1,627 @@
+"""
+Lingo 客户端
+替代 lingo-sync 中的 Node 版 lingo CLI：从 Lingo 拉取翻译并写入 lingo-sync/src/locales 下的语言文件
+
+- 复用 HTTP 连接（keep-alive 连接池）
+- 每个请求单独缓存，用 ETag / If-Modified-Since 发送条件请求，未变化的响应直接使用缓存
+- 可选分页：在 lingoconfig.json 中配置 pagination 后按页并发拉取
+- 流式解析响应，逐条读取 data.records，不需要先把整个响应读成字符串
+
+配置与 Node 版相同：hostname、port、dataPath、languageFiles、keyReplaces、valueReplaces
+来自 lingo-sync/lingoconfig.json，api-path 和 token 来自 as_i18n.yaml 的 lingo 配置。
+port 为 443 时使用 HTTPS，否则使用 HTTP，因此可以直接指向本地的 HTTP 测试服务。
+
+默认一次请求拉取全部数据。接口支持分页时，在 lingoconfig.json 中添加：
+    "pagination": {"pageParam": "current", "sizeParam": "size", "pageSize": 2000}
+pageParam / sizeParam 是接口的页码和每页条数参数名（页码从 1 开始）。响应中有 total 或 pages 时
+其余页并发拉取，否则逐批拉取直到某一页的条数少于 pageSize；拉取的条数与 total 不一致时报错。
+
+用法:
+    python scripts/lingo_client.py [--hostname 127.0.0.1 --port 8000] [--page-size 500] [--no-cache]
+"""
+
+import argparse
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+
+from config_utils import get_lingo_config, get_project_root
+import json_codec
+from json_stream import iter_json_path
+from print_utils import print_step, print_info, print_success, print_error
+
+LINGO_SYNC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lingo-sync')
+LINGO_CONFIG_PATH = os.path.join(LINGO_SYNC_DIR, 'lingoconfig.json')
+
+# 分页参数的默认名称，lingoconfig.json 的 pagination 中没有指定 pageParam / sizeParam 时使用
+PAGE_PARAM = 'current'
+SIZE_PARAM = 'size'
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 60
+
+# 响应缓存目录（相对项目根目录），每个请求地址一个响应体文件和一个记录 ETag 的元数据文件
+CACHE_DIR = os.path.join('build', 'localizations', 'lingo_cache')
+
+# keep-alive 连接被服务端关闭后重试一次
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class LingoClientError(Exception):
+    """Lingo 请求失败或响应不符合预期"""
+
+
+class ConnectionPool:
+    """
+    线程安全的 HTTP 连接池
+
+    空闲连接放在后进先出队列中复用，最多保留 size 个空闲连接。
+    """
+
+    def __init__(self, hostname: str, port: int, size: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        self.hostname = hostname
+        self.port = port
+        self.timeout = timeout
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.port == 443:
+            return http.client.HTTPSConnection(self.hostname, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.hostname, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """返回 (连接, 是否为复用的连接)"""
+        try:
+            return self.idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection):
+        try:
+            self.idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    @contextmanager
+    def request(self, method: str, path: str, headers: Dict[str, str]) -> Iterator[http.client.HTTPResponse]:
+        """
+        发送请求并返回响应
+
+        响应需要在 with 代码块内读完，退出时连接放回连接池；代码块内出错时关闭连接。
+        """
+        while True:
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+                break
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+            except Exception:
+                connection.close()
+                raise
+
+        try:
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        if response.isclosed() and not response.will_close:
+            self._release(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ResponseCache:
+    """
+    按请求地址缓存响应体，记录 ETag 和 Last-Modified 用于条件请求
+
+    响应体以 <hash>.json 保存，元数据以 <hash>.meta.json 保存；新的响应先写临时文件，
+    确认内容有效后才替换缓存。
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{name}.json"), os.path.join(self.cache_dir, f"{name}.meta.json")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return {}
+        try:
+            meta = json_codec.load_file(meta_path)
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def open_body(self, url: str):
+        return open(self._paths(url)[0], 'rb')
+
+    def temp_body_path(self, url: str) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return f"{self._paths(url)[0]}.{threading.get_ident()}.tmp"
+
+    def commit(self, url: str, temp_path: str, etag: Optional[str], last_modified: Optional[str]):
+        """保存新的响应体；服务端没有返回校验信息时不缓存"""
+        body_path, meta_path = self._paths(url)
+        if not (etag or last_modified):
+            os.remove(temp_path)
+            return
+        os.replace(temp_path, body_path)
+        json_codec.write_file(meta_path, {'url': url, 'etag': etag, 'last_modified': last_modified})
+
+
+class _TeeReader:
+    """读取响应的同时把内容写入缓存临时文件"""
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.source.read(size)
+        if chunk:
+            self.sink.write(chunk)
+        return chunk
+
+
+@dataclass
+class PageResult:
+    """一页的解析结果"""
+    records: List[Dict[str, Any]]
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    cached: bool = False
+
+
+@dataclass
+class LingoData:
+    """按语言整理的翻译：languages[语言代码][键] = 值，longest[键] = 最长的语言"""
+    languages: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    longest: Dict[str, str] = field(default_factory=dict)
+    record_count: int = 0
+    fetched_pages: int = 0
+    cached_pages: int = 0
+
+    def add_records(self, records: List[Dict[str, Any]]):
+        for record in records:
+            key = record['key']
+            self.longest[key] = record.get('longest_language')
+            for language in record.get('languages') or []:
+                self.languages.setdefault(language['code'], {})[key] = language['value']
+            self.record_count += 1
+
+
+def load_lingo_file_config(config_path: str = LINGO_CONFIG_PATH) -> Dict[str, Any]:
+    """读取 lingo-sync/lingoconfig.json"""
+    try:
+        return json_codec.load_file(config_path)
+    except FileNotFoundError:
+        raise LingoClientError(f"找不到 {config_path}")
+    except ValueError as e:
+        raise LingoClientError(f"解析 {config_path} 时出错: {e}")
+
+
+def with_query(path: str, params: Dict[str, Any]) -> str:
+    """在请求路径上追加查询参数，保留已有的参数"""
+    parts = urlsplit(path)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query = [(name, value) for name, value in query if name not in params]
+    query += [(name, str(value)) for name, value in params.items()]
+    return urlunsplit(('', '', parts.path, urlencode(query), parts.fragment))
+
+
+class LingoClient:
+    """
+    Lingo 接口客户端
+
+    用法:
+        with LingoClient(hostname, port, api_path, token) as client:
+            data = client.fetch_all('data.records')
+    """
+
+    def __init__(self,
+                 hostname: str,
+                 port: int,
+                 api_path: str,
+                 token: str,
+                 page_size: int = 0,
+                 max_workers: int = DEFAULT_WORKERS,
+                 cache: Optional[ResponseCache] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 page_param: str = PAGE_PARAM,
+                 size_param: str = SIZE_PARAM):
+        self.hostname = hostname
+        self.port = port
+        self.api_path = api_path
+        self.token = token
+        # 0 表示不分页，一次请求拉取全部数据
+        self.page_size = page_size
+        self.page_param = page_param
+        self.size_param = size_param
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.pool = ConnectionPool(hostname, port, size=self.max_workers, timeout=timeout)
+
+    def page_path(self, page: int) -> str:
+        if not self.page_size:
+            return self.api_path
+        return with_query(self.api_path, {self.page_param: page, self.size_param: self.page_size})
+
+    def _headers(self, url: str) -> Dict[str, str]:
+        headers = {
+            'Authorization': self.token,
+            'Content-Type': 'application/json; charset=utf-8',
+            'Accept-Charset': 'utf-8',
+            'Accept-Encoding': 'gzip',
+        }
+        if self.cache is not None:
+            headers.update(self.cache.conditional_headers(url))
+        return headers
+
+    def _parse_page(self, stream, data_path: str, url: str) -> PageResult:
+        others = {}
+        try:
+            records = list(iter_json_path(stream, data_path, others))
+        except json.JSONDecodeError as e:
+            raise LingoClientError(f"解析 {url} 的响应时出错: {e}")
+        if others.get('code') != 200:
+            raise LingoClientError(f"Lingo 接口返回错误: {others.get('message') or others.get('code')}")
+
+        container = data_path.rsplit('.', 1)[0] if '.' in data_path else ''
+        prefix = f"{container}." if container else ''
+        return PageResult(records=records, total=others.get(f"{prefix}total"), pages=others.get(f"{prefix}pages"))
+
+    def fetch_page(self, page: int, data_path: str) -> PageResult:
+        """拉取并解析一页，响应未变化（304）时使用缓存"""
+        path = self.page_path(page)
+        url = f"{self.hostname}:{self.port}{path}"
+        with self.pool.request('GET', path, self._headers(url)) as response:
+            if response.status == 304 and self.cache is not None:
+                response.read()
+                with self.cache.open_body(url) as f:
+                    result = self._parse_page(f, data_path, url)
+                result.cached = True
+                return result
+
+            if response.status != 200:
+                body = response.read(1024).decode('utf-8', errors='replace')
+                raise LingoClientError(f"请求 {url} 失败: HTTP {response.status} {body}")
+
+            stream = response
+            if (response.getheader('Content-Encoding') or '').lower() == 'gzip':
+                stream = gzip.GzipFile(fileobj=response)
+
+            if self.cache is None:
+                result = self._parse_page(stream, data_path, url)
+                response.read()
+                return result
+
+            temp_path = self.cache.temp_body_path(url)
+            try:
+                with open(temp_path, 'wb') as sink:
+                    result = self._parse_page(_TeeReader(stream, sink), data_path, url)
+                response.read()
+                self.cache.commit(url, temp_path, response.getheader('ETag'), response.getheader('Last-Modified'))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            return result
+
+    def page_count(self, first_page: PageResult) -> Optional[int]:
+        """
+        根据第一页返回的分页信息计算总页数
+
+        Returns:
+            int: 不分页或者一页已经包含全部数据时为 1；响应中没有 total 和 pages 时返回 None，
+            需要逐页拉取直到某一页的条数少于每页条数
+        """
+        if not self.page_size or len(first_page.records) < self.page_size:
+            return 1
+        if len(first_page.records) > self.page_size:
+            # 接口忽略了分页参数，一次返回了全部数据
+            return 1
+        if isinstance(first_page.total, int) and len(first_page.records) >= first_page.total:
+            return 1
+        if isinstance(first_page.pages, int):
+            return max(1, first_page.pages)
+        if isinstance(first_page.total, int):
+            return max(1, -(-first_page.total // self.page_size))
+        return None
+
+    def _fetch_until_short_page(self, data_path: str, pages: List[PageResult]):
+        """没有分页信息时按批并发拉取后续页，直到某一页的条数少于每页条数"""
+        next_page = len(pages) + 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                batch = range(next_page, next_page + self.max_workers)
+                for page, result in zip(batch, executor.map(lambda page: self.fetch_page(page, data_path), batch)):
+                    if len(result.records) > self.page_size:
+                        raise LingoClientError(f"第 {page} 页返回了 {len(result.records)} 条，"
+                                               f"超过每页条数 {self.page_size}，请检查 pagination 配置")
+                    previous = pages[-1]
+                    if result.records and previous.records and result.records[0] == previous.records[0]:
+                        raise LingoClientError(f"第 {page} 页与第 {page - 1} 页的内容相同，"
+                                               f"接口可能不支持参数 {self.page_param}，请检查 pagination 配置")
+                    pages.append(result)
+                    if len(result.records) < self.page_size:
+                        return
+                next_page += self.max_workers
+
+    def fetch_all(self, data_path: str, data: Optional[LingoData] = None) -> LingoData:
+        """
+        拉取所有页，结果按页的顺序合并
+
+        第一页确定总页数后其余页并发拉取；没有分页信息时逐批拉取直到出现不满一页的页。
+
+        Raises:
+            LingoClientError: 如果拉取的条数与接口返回的 total 不一致，或者分页参数看起来没有生效
+        """
+        data = data if data is not None else LingoData()
+        first_page = self.fetch_page(1, data_path)
+        pages = [first_page]
+
+        page_count = self.page_count(first_page)
+        if page_count is None:
+            self._fetch_until_short_page(data_path, pages)
+        elif page_count > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages += list(executor.map(lambda page: self.fetch_page(page, data_path), range(2, page_count + 1)))
+
+        record_count = sum(len(page.records) for page in pages)
+        if isinstance(first_page.total, int) and record_count != first_page.total:
+            raise LingoClientError(f"拉取了 {record_count} 条，但接口返回的总数是 {first_page.total}，"
+                                   f"请检查 pagination 配置")
+
+        for page in pages:
+            data.add_records(page.records)
+            data.fetched_pages += 1
+            data.cached_pages += page.cached
+        return data
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_records_file(file_path: str, data_path: str = 'data.records', data: Optional[LingoData] = None) -> LingoData:
+    """
+    读取保存下来的 Lingo 数据：完整的接口响应（按 data_path 读取 records）或者 records 数组
+
+    Raises:
+        LingoClientError: 如果文件无法解析或者接口响应中的 code 不是 200
+    """
+    data = data if data is not None else LingoData()
+    others = {}
+    try:
+        with open(file_path, 'rb') as f:
+            records = list(iter_json_path(f, data_path, others))
+    except json.JSONDecodeError as e:
+        raise LingoClientError(f"解析 {file_path} 时出错: {e}")
+
+    if isinstance(others.get(''), list):
+        records = others['']
+    elif 'code' in others and others['code'] != 200:
+        raise LingoClientError(f"{file_path} 中的接口响应为错误: {others.get('message') or others['code']}")
+    data.add_records(records)
+    return data
+
+
+def replace_all(text: str, replaces: List[Dict[str, str]]) -> str:
+    for replace in replaces or []:
+        text = text.replace(replace['from'], replace['to'])
+    return text
+
+
+def to_unicode_escapes(text: str) -> str:
+    """非 ASCII 字符按 UTF-16 编码单元转义为 \\uXXXX（与 Node 版的 valueToUnicode 一致）"""
+    result = []
+    for char in text:
+        if ord(char) < 128:
+            result.append(char)
+            continue
+        encoded = char.encode('utf-16-be')
+        for index in range(0, len(encoded), 2):
+            result.append('\\u%04X' % int.from_bytes(encoded[index:index + 2], 'big'))
+    return ''.join(result)
+
+
+def render_language_lines(translations: Dict[str, str], lingo_config: Dict[str, Any]) -> List[str]:
+    """按 fileConfig.template 生成语言文件中 lingo-start 与 lingo-end 之间的行"""
+    template = lingo_config['fileConfig']['template']
+    key_replaces = lingo_config.get('keyReplaces')
+    value_replaces = lingo_config.get('valueReplaces')
+    value_to_unicode = lingo_config.get('valueToUnicode')
+
+    lines = []
+    for key, value in translations.items():
+        key = replace_all(key, key_replaces)
+        value = replace_all(value, value_replaces)
+        if value_to_unicode:
+            value = to_unicode_escapes(value)
+        # 一次替换两个占位符，避免值中的 {{key}} 被再次替换
+        line = template.replace('{{key}}', '\0key\0').replace('{{value}}', '\0value\0')
+        line = line.replace('\0key\0', key).replace('\0value\0', value)
+        lines.append(line)
+    return lines
+
+
+def write_language_file(file_path: str, lines: List[str], start_tag: str, end_tag: str) -> bool:
+    """
+    替换语言文件中开始标记与结束标记之间的内容，先写临时文件再重命名
+
+    Returns:
+        bool: 是否找到了标记并写入
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        original = f.read().split('\n')
+
+    output = []
+    inside = False
+    replaced = False
+    for line in original:
+        if inside and end_tag in line:
+            output.extend(lines)
+            inside = False
+            replaced = True
+        if not inside:
+            output.append(line)
+        if start_tag in line and end_tag not in line:
+            inside = True
+
+    if not replaced:
+        return False
+
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\n'.join(output))
+    os.replace(temp_path, file_path)
+    return True
+
+
+def iter_language_file_paths(lingo_config: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(语言代码, 语言文件相对路径)，支持 path 和 paths 两种写法"""
+    for language_file in lingo_config.get('languageFiles', []):
+        if language_file.get('path'):
+            yield language_file['code'], language_file['path']
+        for path in language_file.get('paths') or []:
+            yield language_file['code'], path
+
+
+def write_language_files(data: LingoData, lingo_config: Dict[str, Any], base_dir: str = LINGO_SYNC_DIR) -> int:
+    """
+    把拉取的翻译写入 lingoconfig.json 中配置的语言文件
+
+    Returns:
+        int: 写入的文件数
+    """
+    file_config = lingo_config['fileConfig']
+    written = 0
+    for code, relative_path in iter_language_file_paths(lingo_config):
+        file_path = os.path.join(base_dir, relative_path)
+        if not os.path.exists(file_path):
+            print_error(f"语言文件不存在: {file_path}")
+            continue
+        lines = render_language_lines(data.languages.get(code, {}), lingo_config)
+        if write_language_file(file_path, lines, file_config['startTag'], file_config['endTag']):
+            written += 1
+        else:
+            print_error(f"{file_path} 中没有找到 {file_config['startTag']} 和 {file_config['endTag']}")
+    return written
+
+
+def create_client(lingo_config: Dict[str, Any], hostname: Optional[str] = None, port: Optional[int] = None,
+                  page_size: Optional[int] = None, max_workers: int = DEFAULT_WORKERS,
+                  use_cache: bool = True) -> LingoClient:
+    """
+    根据 lingoconfig.json 和 as_i18n.yaml 创建客户端
+
+    hostname 和 port 可以覆盖配置（例如指向本地测试服务）；page_size 覆盖 pagination.pageSize，
+    0 表示不分页，None 表示使用配置（没有 pagination 时不分页）。
+    """
+    as_i18n_lingo = get_lingo_config()
+    api_path = as_i18n_lingo.get('api-path')
+    token = as_i18n_lingo.get('token')
+    if not api_path or not token:
+        raise LingoClientError("as_i18n.yaml 的 lingo 配置中缺少 api-path 或 token")
+
+    pagination = lingo_config.get('pagination') or {}
+    if page_size is None:
+        page_size = int(pagination.get('pageSize') or 0)
+
+    cache = ResponseCache(os.path.join(get_project_root(), CACHE_DIR)) if use_cache else None
+    return LingoClient(
+        hostname=hostname or lingo_config['hostname'],
+        port=int(port or lingo_config.get('port') or 80),
+        api_path=api_path,
+        token=str(token),
+        page_size=page_size,
+        max_workers=max_workers,
+        cache=cache,
+        page_param=pagination.get('pageParam') or PAGE_PARAM,
+        size_param=pagination.get('sizeParam') or SIZE_PARAM,
+    )
+
+
+def fetch_lingo_data(lingo_config: Dict[str, Any], **client_options) -> LingoData:
+    """拉取 lingoconfig.json 中所有 resources 的翻译"""
+    data = LingoData()
+    with create_client(lingo_config, **client_options) as client:
+        for resource in lingo_config.get('resources') or [{}]:
+            client.fetch_all(resource.get('dataPath') or 'data', data)
+    return data
+
+
+def sync_language_files(hostname: Optional[str] = None, port: Optional[int] = None,
+                        page_size: Optional[int] = None, max_workers: int = DEFAULT_WORKERS,
+                        use_cache: bool = True) -> LingoData:
+    """
+    从 Lingo 拉取翻译并写入 lingo-sync/src/locales 下的语言文件（替代 Node 版 lingo 命令）
+
+    Raises:
+        LingoClientError: 如果请求失败或响应无效
+    """
+    lingo_config = load_lingo_file_config()
+    data = fetch_lingo_data(lingo_config, hostname=hostname, port=port, page_size=page_size,
+                            max_workers=max_workers, use_cache=use_cache)
+    print_info(f"拉取了 {data.fetched_pages} 页、{data.record_count} 条翻译"
+               f"（{data.cached_pages} 页未变化，使用缓存）")
+    written = write_language_files(data, lingo_config)
+    print_success(f"已更新 {written} 个语言文件")
+    return data
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="从 Lingo 拉取翻译并写入 lingo-sync/src/locales 下的语言文件")
+    parser.add_argument('--hostname', help='覆盖 lingoconfig.json 中的 hostname')
+    parser.add_argument('--port', type=int, help='覆盖 lingoconfig.json 中的 port（443 使用 HTTPS，其他端口使用 HTTP）')
+    parser.add_argument('--page-size', type=int,
+                        help='覆盖 lingoconfig.json 中 pagination 的 pageSize，0 表示不分页；默认使用配置，没有配置时不分页')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f'并发请求数，默认 {DEFAULT_WORKERS}')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用条件请求和响应缓存')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print_step("LINGO", "拉取灵果翻译")
+    try:
+        sync_language_files(args.hostname, args.port, args.page_size, args.workers, args.use_cache)
+    except (LingoClientError, OSError, http.client.HTTPException) as e:
+        print_error(f"拉取 Lingo 翻译失败: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Lingo 语言文件解析模块
+逐行扫描 lingo-sync/src/locales/*.js 中 // lingo-start 与 // lingo-end 之间的内容，按需产出键值对
+
+lingo CLI 按 lingoconfig.json 中的模板写入 `  "key": "value",`，值中的换行会被写成行尾反斜杠
+（JS 的续行符，解析后不保留换行），这里按 JS 字符串字面量的规则解码。
+"""
+
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+LINGO_START_TAG = '// lingo-start'
+LINGO_END_TAG = '// lingo-end'
+
+# 行内的各类词法单元，全部使用 match 从当前位置开始匹配
+_SKIP = re.compile(r'[\s,]+')
+_STRING = {
+    '"': re.compile(r'"((?:[^"\\\n]|\\.)*)"'),
+    "'": re.compile(r"'((?:[^'\\\n]|\\.)*)'"),
+}
+# 未闭合且以续行反斜杠结尾的字符串（末尾为奇数个反斜杠）
+_CONTINUED_STRING = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\.)*\\\n?$'),
+    "'": re.compile(r"'(?:[^'\\\n]|\\.)*\\\n?$"),
+}
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_COLON = re.compile(r'\s*:\s*')
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.DOTALL)
+
+_SIMPLE_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+}
+
+
+class LingoParseError(ValueError):
+    """语言文件格式错误"""
+
+    def __init__(self, message: str, line_number: int):
+        super().__init__(f"第 {line_number} 行: {message}")
+        self.line_number = line_number
+
+
+def _replace_escape(match) -> str:
+    escape = match.group(1)
+    if escape.startswith('u{'):
+        return chr(int(escape[2:-1], 16))
+    if escape[0] in 'ux' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    # 未知转义（包括 \" \\ \'）按 JS 规则保留字符本身
+    return _SIMPLE_ESCAPES.get(escape, escape)
+
+
+def decode_js_string(body: str) -> str:
+    """解码 JS 字符串字面量的内容（不含两侧引号）"""
+    if '\\' not in body:
+        return body
+    value = _ESCAPE.sub(_replace_escape, body)
+    # valueToUnicode 会把非 BMP 字符写成两个 \uXXXX 代理项，这里合并回一个字符
+    if any('\ud800' <= char <= '\udfff' for char in value):
+        value = value.encode('utf-16', 'surrogatepass').decode('utf-16')
+    return value
+
+
+def iter_lingo_entries(lines: Iterable[str], prefix: str = '') -> Iterator[Tuple[str, str]]:
+    """
+    逐行解析 lingo 区块，产出 (去掉前缀的键, 值)
+
+    只保留以 prefix 开头的键，其余键的值不会被解码。不会把区块拼接成完整字符串，
+    内存占用只与单个条目的长度有关。
+
+    Args:
+        lines: 语言文件的行（可以直接传入打开的文件对象）
+        prefix: 需要保留的键前缀
+
+    Raises:
+        LingoParseError: 如果缺少 // lingo-start 或 // lingo-end 标记，或条目格式错误
+    """
+    started = False
+    key: Optional[str] = None
+    expect_colon = False
+    pending = ''  # 跨行字符串中已经读取的部分
+    pending_line_number = 0
+
+    for line_number, line in enumerate(lines, 1):
+        if not started:
+            if LINGO_START_TAG in line:
+                started = True
+            continue
+
+        if pending:
+            line = pending + line
+            line_number = pending_line_number
+            pending = ''
+
+        pos = 0
+        length = len(line)
+        while pos < length:
+            match = _SKIP.match(line, pos)
+            if match:
+                pos = match.end()
+                continue
+
+            if line.startswith('//', pos):
+                if line.startswith(LINGO_END_TAG, pos):
+                    if key is not None:
+                        raise LingoParseError(f"键 {key} 缺少值", line_number)
+                    return
+                break  # 注释，忽略本行剩余内容
+
+            if expect_colon:
+                match = _COLON.match(line, pos)
+                if not match:
+                    raise LingoParseError(f"键 {key} 后缺少 ':'", line_number)
+                pos = match.end()
+                expect_colon = False
+                continue
+
+            char = line[pos]
+            if char in _STRING:
+                match = _STRING[char].match(line, pos)
+                if not match:
+                    if _CONTINUED_STRING[char].match(line, pos):
+                        # 去掉续行的反斜杠和换行，与下一行拼接后重新扫描这个字符串
+                        pending = line[pos:].rstrip('\n')[:-1]
+                        pending_line_number = line_number
+                        break
+                    raise LingoParseError("字符串没有闭合", line_number)
+                pos = match.end()
+                token = match.group(1)
+            elif key is None:
+                match = _IDENTIFIER.match(line, pos)
+                if not match:
+                    raise LingoParseError(f"无法识别的内容: {line[pos:].strip()}", line_number)
+                pos = match.end()
+                token = match.group(0)
+            else:
+                raise LingoParseError(f"键 {key} 的值不是字符串", line_number)
+
+            if key is None:
+                key = decode_js_string(token)
+                expect_colon = True
+            else:
+                if key.startswith(prefix):
+                    yield key[len(prefix):], decode_js_string(token)
+                key = None
+
+    if pending:
+        raise LingoParseError("字符串没有闭合", pending_line_number)
+    if not started:
+        raise LingoParseError(f"找不到 {LINGO_START_TAG} 标记", 0)
+    raise LingoParseError(f"找不到 {LINGO_END_TAG} 标记", 0)
@@ -0,0 +1,160 @@
+"""
+Lingo 快照模块
+保存上次导入的 Lingo 数据：每个键在每种语言下的值的哈希，供 diff_to_lingo.py 判断哪些键在 Lingo 中已有相同的值。
+导入时的增量更新（新增、修改和删除的键）与现有的 ARB 文件比较，不依赖快照，
+因此 ARB 被其他途径修改（Node 版导入、排序、手工编辑）后增量更新仍然正确
+
+快照以单行 JSON 保存在 build/localizations/lingo_snapshot.json：
+    {"version": 2, "locales": ["en_US", "zh_Hans_CN"], "keys": {"key": ["<32 位十六进制>", null]}}
+keys 中每个键的哈希列表与 locales 一一对应，null 表示该语言没有这个键。
+哈希为 16 字节的 blake2b，碰撞会让修改被当作没有变化而漏掉，因此不使用更短的哈希。
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import json_codec
+from print_utils import print_info
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PATH = os.path.join('build', 'localizations', 'lingo_snapshot.json')
+
+# 摘要中每种语言最多列出的键数
+MAX_PRINTED_KEYS = 10
+
+
+def value_hash(value: str) -> str:
+    """值的哈希，用于比较同一个键前后两次的值"""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class LocaleDelta:
+    """一种语言的键级变化"""
+    added: Dict[str, str] = field(default_factory=dict)
+    changed: Dict[str, str] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+
+class LingoSnapshot:
+    """键 -> 各语言值哈希的快照"""
+
+    def __init__(self, locales: Optional[List[str]] = None, keys: Optional[Dict[str, List[Optional[str]]]] = None):
+        self.locales = list(locales or [])
+        self.keys = keys or {}
+
+    @classmethod
+    def from_arb_files(cls, arb_files: Dict[str, dict]) -> 'LingoSnapshot':
+        """根据各语言的 ARB 数据（项目语言代码 -> ARB 数据）生成快照"""
+        locales = sorted(arb_files)
+        keys: Dict[str, List[Optional[str]]] = {}
+        for index, locale in enumerate(locales):
+            for key, value in arb_files[locale].items():
+                if key.startswith('@'):
+                    continue
+                if key not in keys:
+                    keys[key] = [None] * len(locales)
+                keys[key][index] = value_hash(value)
+        return cls(locales, keys)
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional['LingoSnapshot']:
+        """读取快照，文件不存在、无法解析或版本不同时返回 None"""
+        if not os.path.exists(file_path):
+            return None
+        try:
+            data = json_codec.load_file(file_path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+            return None
+        return cls(data.get('locales'), data.get('keys'))
+
+    def save(self, file_path: str):
+        """写入单行 JSON，先写临时文件再重命名"""
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        temp_path = f"{file_path}.tmp"
+        payload = {'version': SNAPSHOT_VERSION, 'locales': self.locales, 'keys': self.keys}
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json_codec.dumps_compact(payload) + '\n')
+        os.replace(temp_path, file_path)
+
+    def locale_hashes(self, locale: str) -> Optional[Dict[str, str]]:
+        """某种语言的 {键: 值哈希}，快照中没有该语言时返回 None"""
+        if locale not in self.locales:
+            return None
+        index = self.locales.index(locale)
+        return {key: hashes[index] for key, hashes in self.keys.items() if hashes[index] is not None}
+
+    def merged(self, arb_files: Dict[str, dict]) -> 'LingoSnapshot':
+        """用本次导入的语言替换快照中对应的语言，本次没有数据的语言保留原来的哈希"""
+        snapshot = LingoSnapshot.from_arb_files(arb_files)
+        kept = [locale for locale in self.locales if locale not in arb_files]
+        if not kept:
+            return snapshot
+
+        locales = sorted(set(snapshot.locales) | set(kept))
+        keys: Dict[str, List[Optional[str]]] = {}
+        for source, source_locales in ((snapshot, snapshot.locales), (self, kept)):
+            for locale in source_locales:
+                index = locales.index(locale)
+                for key, key_hash in source.locale_hashes(locale).items():
+                    keys.setdefault(key, [None] * len(locales))[index] = key_hash
+        return LingoSnapshot(locales, keys)
+
+
+def diff_arb(existing: dict, arb_data: dict) -> LocaleDelta:
+    """
+    计算新数据相对现有 ARB 数据的变化（忽略 @ 开头的元数据键）
+
+    Returns:
+        LocaleDelta: 新增和修改的键附带新值，删除的键按名称排序
+    """
+    old_keys = {key for key in existing if not key.startswith('@')}
+    delta = LocaleDelta()
+    for key, value in arb_data.items():
+        if key.startswith('@'):
+            continue
+        if key not in existing:
+            delta.added[key] = value
+        elif existing[key] != value:
+            delta.changed[key] = value
+        old_keys.discard(key)
+    delta.removed = sorted(old_keys)
+    return delta
+
+
+def apply_delta(arb_data: dict, delta: LocaleDelta) -> dict:
+    """
+    把变化应用到现有的 ARB 数据上：修改的键原地更新，新增的键追加到末尾，删除的键移除
+
+    未变化的条目保持原样，包括本地对它们的排序。
+    """
+    removed = set(delta.removed)
+    result = {key: value for key, value in arb_data.items() if key not in removed}
+    result.update(delta.changed)
+    result.update(delta.added)
+    return result
+
+
+def print_delta_summary(deltas: Dict[str, LocaleDelta]):
+    """打印每种语言的变化摘要"""
+    for locale in sorted(deltas):
+        delta = deltas[locale]
+        if delta.is_empty():
+            print_info(f"{locale}: 没有变化")
+            continue
+        print_info(f"{locale}: 新增 {len(delta.added)}，修改 {len(delta.changed)}，删除 {len(delta.removed)}")
+        for label, keys in (('新增', list(delta.added)), ('修改', list(delta.changed)), ('删除', delta.removed)):
+            if keys:
+                shown = keys[:MAX_PRINTED_KEYS]
+                print_info(f"  {label}: {', '.join(shown)}" + (" ..." if len(keys) > len(shown) else ""))
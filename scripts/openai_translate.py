@@ -1,39 +1,97 @@
+import argparse
 import json
-import os
+import re
 import sys
 from pathlib import Path
 import openai
 from colorama import Fore, Style
-from config_utils import get_openai_api_key, get_project_root
-from print_utils import print_step, print_info, print_success, print_error
+from config_utils import get_lingo_locale, get_locales, get_openai_api_key, get_openai_base_url, get_project_root
+import json_codec
+from json_stream import write_json_items
+from print_utils import print_info, print_success, print_error
+from translation_journal import TranslationJournal, file_sha256
+from translation_memory import TranslationMemory, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_AGE_DAYS
+from translation_scheduler import TranslationScheduler, estimate_tokens, is_retryable_error
 
 localizations_sdk_dir = Path(__file__).parent.parent
 
-# 设置 OpenAI API key
-api_key = get_openai_api_key()
-if api_key:
-    openai.api_key = api_key
-else:
-    print_error(f"{Fore.RED}❌ 无法获取 OpenAI API key，程序退出{Style.RESET_ALL}")
-    sys.exit(1)
+DEFAULT_MODEL = "gpt-4"
+MAX_OUTPUT_TOKENS = 1000
+DEFAULT_BATCH_TOKEN_BUDGET = 1500
+TARGET_LOCALE = "en_US"
+SOURCE_LOCALE = "zh_Hans_CN"
+
+# 提示词中使用的目标语言名称，键为 Lingo 语言代码
+LANGUAGE_NAMES = {
+    "en_US": "英文",
+    "zh_HK": "繁体中文（香港）",
+    "zh_Hant_TW": "繁体中文（台湾）",
+    "ja_JP": "日文",
+    "ko_KR": "韩文",
+    "es_ES": "西班牙文",
+    "fil_PH": "菲律宾文",
+    "fr_FR": "法文",
+    "pt_PT": "葡萄牙文",
+    "th_TH": "泰文",
+    "tr_TR": "土耳其文",
+    "vi_VN": "越南文",
+    "de_DE": "德文",
+    "it_IT": "意大利文",
+    "ru_RU": "俄文",
+    "id_ID": "印度尼西亚文",
+}
+TRANSLATION_MEMORY_FILE = "translation_memory.sqlite3"
+JOURNAL_FILE = "openai_translate.journal.jsonl"
+
+def create_openai_client():
+    """
+    创建 OpenAI 客户端
+
+    接口地址优先使用 as_i18n.yaml 中的 openai-base-url，其次是 OPENAI_BASE_URL 环境变量，
+    便于在本地用桩服务替代 OpenAI 接口进行测试。
+    """
+    try:
+        api_key = get_openai_api_key()
+    except KeyError:
+        api_key = None
+    if not api_key:
+        print_error(f"{Fore.RED}❌ 无法获取 OpenAI API key，程序退出{Style.RESET_ALL}")
+        sys.exit(1)
+    return openai.OpenAI(api_key=api_key, base_url=get_openai_base_url(), max_retries=0)
+
+def is_retryable_openai_error(error):
+    """OpenAI 的连接和超时错误没有状态码，需要单独识别"""
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return is_retryable_error(error)
+
+def create_scheduler(concurrency=4, rpm=None, tpm=None, max_retries=5):
+    """创建带限流和重试策略的翻译调度器"""
+    return TranslationScheduler(
+        concurrency=concurrency,
+        rpm=rpm,
+        tpm=tpm,
+        max_retries=max_retries,
+        is_retryable=is_retryable_openai_error,
+    )
 
 def check_required_files(root_dir):
     """检查必要的文件是否存在"""
     diff_file = root_dir / "build" / "localizations" / "diff.json"
     prompt_file = localizations_sdk_dir / "scripts" / "prompt.txt"
-    
+
     # 检查 diff.json
     if not diff_file.exists():
         print_error(f"{Fore.RED}❌ 找不到文件: {diff_file}{Style.RESET_ALL}")
         print_error(f"{Fore.YELLOW}💡 请先运行 make export_translations_diff 生成 diff.json{Style.RESET_ALL}")
         return False, None, None
-    
+
     # 检查 prompt.txt
     if not prompt_file.exists():
         print_error(f"{Fore.RED}❌ 找不到文件: {prompt_file}{Style.RESET_ALL}")
         print_error(f"{Fore.YELLOW}💡 请确保 prompt.txt 文件存在于 scripts/ 目录下{Style.RESET_ALL}")
         return False, None, None
-    
+
     # 读取 prompt.txt
     try:
         with open(prompt_file, 'r', encoding='utf-8') as f:
@@ -41,37 +99,204 @@ def check_required_files(root_dir):
     except Exception as e:
         print_error(f"{Fore.RED}❌ 读取 prompt.txt 失败: {str(e)}{Style.RESET_ALL}")
         return False, None, None
-    
+
     return True, diff_file, prompt_content
 
-def translate_text(text, prompt):
-    """使用 OpenAI API 翻译文本"""
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4",  # 使用 GPT-4 模型
+def request_completion(client, scheduler, prompt, user_content, estimated_tokens, model=DEFAULT_MODEL, max_tokens=MAX_OUTPUT_TOKENS):
+    """发送一次 chat completion 请求并返回回复文本，限流与失败重试由 scheduler 负责"""
+    def request():
+        return client.chat.completions.create(
+            model=model,
             messages=[
                 {
-                    "role": "system", 
+                    "role": "system",
                     "content": prompt
                 },
                 {
-                    "role": "user", 
-                    "content": f"请将以下中文翻译成英文：\n{text}"
+                    "role": "user",
+                    "content": user_content
                 }
             ],
             temperature=0.2,  # 降低温度以获得更稳定的输出
-            max_tokens=1000,  # 设置最大输出长度
+            max_tokens=max_tokens,  # 设置最大输出长度
         )
-        return response.choices[0].message.content.strip()
+
+    response = scheduler.call(request, estimated_tokens)
+    return response.choices[0].message.content.strip()
+
+def get_language_name(locale):
+    """获取提示词中使用的目标语言名称"""
+    return LANGUAGE_NAMES.get(locale, locale)
+
+def translate_text(text, prompt, client, scheduler, model=DEFAULT_MODEL, locale=TARGET_LOCALE):
+    """使用 OpenAI API 翻译单条文本"""
+    user_content = f"请将以下中文翻译成{get_language_name(locale)}：\n{text}"
+    estimated_tokens = estimate_tokens(prompt) + estimate_tokens(user_content) + estimate_tokens(text) * 2
+
+    try:
+        return request_completion(client, scheduler, prompt, user_content, estimated_tokens, model)
     except Exception as e:
         print_error(f"{Fore.RED}❌ 翻译出错: {str(e)}{Style.RESET_ALL}")
         return None
 
-def process_diff_file():
-    """处理 diff.json 文件并生成英文翻译"""
+def build_batches(items, batch_size, token_budget):
+    """
+    将 (key, value) 列表按顺序切分为批次
+
+    每个批次最多 batch_size 个键，且批次内文本的估算 token 数不超过 token_budget。
+    单个超出预算的文本会独占一个批次。
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for key, value in items:
+        tokens = estimate_tokens(key) + estimate_tokens(value)
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append((key, value))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def parse_batch_reply(reply, keys):
+    """
+    解析批量翻译的 JSON 回复
+
+    兼容模型在回复外包裹 ```json 代码块的情况。只保留请求中存在且值为非空字符串的键。
+
+    Returns:
+        dict: 成功解析的 key -> 译文
+    """
+    content = reply.strip()
+    fence = re.match(r'^```(?:json)?\s*([\s\S]*?)\s*```$', content)
+    if fence:
+        content = fence.group(1)
+    else:
+        start, end = content.find('{'), content.rfind('}')
+        if start != -1 and end > start:
+            content = content[start:end + 1]
+
+    try:
+        data = json_codec.loads(content)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    results = {}
+    for key in keys:
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            results[key] = value.strip()
+    return results
+
+def translate_batch(batch, prompt, client, scheduler, model=DEFAULT_MODEL, locale=TARGET_LOCALE):
+    """
+    将一批键打包成一个 JSON 对象翻译
+
+    回复中缺失或无法解析的键会逐个调用 translate_text 重新翻译。
+
+    Returns:
+        dict: key -> 译文（翻译失败的键值为 None）
+    """
+    source = dict(batch)
+    if len(batch) > 1:
+        payload = json_codec.dumps(source)
+        user_content = (
+            f"请将以下 JSON 对象中每个键对应的中文值翻译成{get_language_name(locale)}。"
+            "保持键不变，只返回一个 JSON 对象，不要输出任何其他内容：\n"
+            f"{payload}"
+        )
+        text_tokens = estimate_tokens(payload)
+        estimated_tokens = estimate_tokens(prompt) + estimate_tokens(user_content) + text_tokens * 2
+        try:
+            reply = request_completion(
+                client, scheduler, prompt, user_content, estimated_tokens, model,
+                max_tokens=max(MAX_OUTPUT_TOKENS, text_tokens * 3),
+            )
+            results = parse_batch_reply(reply, source.keys())
+        except Exception as e:
+            print_error(f"{Fore.RED}❌ 批量翻译出错，改为逐条翻译: {str(e)}{Style.RESET_ALL}")
+            results = {}
+    else:
+        results = {}
+
+    for key, value in batch:
+        if key not in results:
+            results[key] = translate_text(value, prompt, client, scheduler, model, locale)
+    return results
+
+def open_translation_memory(root_dir, use_cache=True,
+                            cache_max_entries=DEFAULT_MAX_ENTRIES, cache_max_age_days=DEFAULT_MAX_AGE_DAYS):
+    """打开 build/localizations 下的翻译记忆，禁用缓存或打开失败时返回 None"""
+    if not use_cache:
+        return None
+    db_path = root_dir / "build" / "localizations" / TRANSLATION_MEMORY_FILE
+    try:
+        return TranslationMemory(str(db_path), cache_max_entries, cache_max_age_days)
+    except Exception as e:
+        print_error(f"{Fore.RED}❌ 打开翻译记忆失败，本次不使用缓存: {str(e)}{Style.RESET_ALL}")
+        return None
+
+def print_memory_stats(memory):
+    """打印翻译记忆的命中统计"""
+    print_info(
+        f"{Fore.CYAN}🗄️  翻译记忆: 命中 {memory.hits}，未命中 {memory.misses}，"
+        f"命中率 {memory.hit_rate():.1%}，写入 {memory.writes}，淘汰 {memory.evicted}，"
+        f"当前 {memory.size()} 条{Style.RESET_ALL}"
+    )
+
+def get_target_locales(all_locales=False):
+    """
+    获取需要翻译的目标语言（Lingo 语言代码）
+
+    默认只翻译英文；all_locales 为 True 时翻译 as_i18n.yaml 中除源语言外的所有语言。
+    """
+    if not all_locales:
+        return [TARGET_LOCALE]
+    targets = []
+    for locale in get_locales():
+        if locale == SOURCE_LOCALE:
+            continue
+        lingo_locale = get_lingo_locale(locale)
+        if lingo_locale not in targets:
+            targets.append(lingo_locale)
+    # diff_to_lingo.py 始终需要 diff_en_US.json
+    if TARGET_LOCALE not in targets:
+        targets.insert(0, TARGET_LOCALE)
+    return targets
+
+def remove_locale_diffs(output_dir):
+    """
+    删除上次生成的 diff_<语言>.json
+
+    这些文件是根据上次的 diff.json 翻译的，diff_to_lingo.py 会读取目录中所有存在的语言文件，
+    保留旧文件会把过期的翻译和本次的键混在一起上传。
+    """
+    for diff_path in sorted(output_dir.glob("diff_*.json")):
+        diff_path.unlink()
+        print_info(f"{Fore.CYAN}🧹 已删除上次生成的 {diff_path.name}{Style.RESET_ALL}")
+
+def process_diff_file(concurrency=4, rpm=None, tpm=None, max_retries=5, model=DEFAULT_MODEL,
+                      batch_size=1, batch_token_budget=DEFAULT_BATCH_TOKEN_BUDGET,
+                      use_cache=True, cache_max_entries=DEFAULT_MAX_ENTRIES,
+                      cache_max_age_days=DEFAULT_MAX_AGE_DAYS, resume=False, all_locales=False):
+    """
+    处理 diff.json 文件并生成目标语言的翻译（默认只生成 diff_en_US.json）
+
+    all_locales 为 True 时同时翻译 as_i18n.yaml 中的所有语言，各语言的请求共用同一个调度器，
+    结果分别写入 diff_<Lingo 语言代码>.json，供 diff_to_lingo.py 使用。
+
+    完成的翻译会实时追加到 build/localizations 下的日志文件中。resume 为 True 且 diff.json
+    内容未变化时，日志中已完成的键会被直接复用，只翻译剩余部分。
+    开始翻译前会删除上次生成的所有 diff_<语言>.json，避免与本次的 diff.json 不一致。
+    """
     # 获取项目根目录
     root_dir = Path(get_project_root())
-    output_file = root_dir / "build" / "localizations" / "diff_en_US.json"
+    output_dir = root_dir / "build" / "localizations"
 
     # 检查必要文件
     files_ok, diff_file, prompt = check_required_files(root_dir)
@@ -80,39 +305,131 @@ def process_diff_file():
 
     # 读取 diff.json
     try:
-        with open(diff_file, 'r', encoding='utf-8') as f:
-            diff_data = json.load(f)
+        diff_data = json_codec.load_file(diff_file)
     except Exception as e:
         print_error(f"{Fore.RED}❌ 读取 diff.json 失败: {str(e)}{Style.RESET_ALL}")
         sys.exit(1)
 
-    # 创建英文翻译数据
-    en_data = {}
-    total_items = len(diff_data)
-    
-    print_info(f"{Fore.CYAN}📝 开始翻译，共 {total_items} 个项目...{Style.RESET_ALL}")
-    print_info(f"{Fore.CYAN}🔧 使用 GPT-4 模型进行翻译{Style.RESET_ALL}")
+    try:
+        locales = get_target_locales(all_locales)
+    except Exception as e:
+        print_error(f"{Fore.RED}❌ 读取语言配置失败: {str(e)}{Style.RESET_ALL}")
+        sys.exit(1)
+
+    remove_locale_diffs(output_dir)
+
+    client = create_openai_client()
+    memory = open_translation_memory(root_dir, use_cache, cache_max_entries, cache_max_age_days)
+    journal_file = output_dir / JOURNAL_FILE
+    journal = TranslationJournal(str(journal_file), file_sha256(str(diff_file)), resume=resume)
+
+    items = list(diff_data.items())
+    total_items = len(items) * len(locales)
+
+    # 每个语言先复用上次中断前完成的翻译，再查询翻译记忆，只有剩余的键才需要请求接口
+    translated = {}
+    tasks = []
+    resumed_count = 0
+    cached_count = 0
+    for locale in locales:
+        resumed = {key: value for key, value in journal.get(locale).items() if key in diff_data}
+        cached = {}
+        if memory:
+            for key, value in items:
+                if key in resumed:
+                    continue
+                translated_value = memory.get(value, locale, prompt, model)
+                if translated_value:
+                    cached[key] = translated_value
+        translated[locale] = {**resumed, **cached}
+        resumed_count += len(resumed)
+        cached_count += len(cached)
+
+        pending = [(key, value) for key, value in items if key not in translated[locale]]
+        for batch in build_batches(pending, max(1, batch_size), batch_token_budget):
+            tasks.append((locale, batch))
+
+    completed = resumed_count + cached_count
+    if resumed_count:
+        print_info(f"{Fore.CYAN}⏯️  从日志恢复了 {resumed_count} 个已完成的翻译{Style.RESET_ALL}")
+    print_info(f"{Fore.CYAN}📝 开始翻译，共 {len(items)} 个项目 × {len(locales)} 种语言，"
+               f"翻译记忆命中 {cached_count} 个，剩余 {total_items - completed} 个分为 {len(tasks)} 个请求...{Style.RESET_ALL}")
+    print_info(f"{Fore.CYAN}🌐 目标语言: {', '.join(locales)}{Style.RESET_ALL}")
+    print_info(f"{Fore.CYAN}🔧 使用 {model} 模型进行翻译，并发数 {concurrency}{Style.RESET_ALL}")
     print_info(f"{Fore.CYAN}📋 使用自定义提示词进行翻译{Style.RESET_ALL}")
 
-    # 翻译每个键值对
-    for i, (key, value) in enumerate(diff_data.items(), 1):
-        print_info(f"{Fore.YELLOW}🔄 正在翻译 ({i}/{total_items}): {key}{Style.RESET_ALL}")
-        
-        translated_value = translate_text(value, prompt)
-        if translated_value:
-            en_data[key] = translated_value
-            print_success(f"{Fore.GREEN}✅ 翻译完成: {value} -> {translated_value}{Style.RESET_ALL}")
-        else:
-            print_error(f"{Fore.RED}❌ 跳过翻译: {key}{Style.RESET_ALL}")
+    def on_result(index, task, batch_results):
+        nonlocal completed
+        locale, batch = task
+        for key, value in batch:
+            completed += 1
+            translated_value = batch_results.get(key)
+            if translated_value:
+                journal.record(locale, key, translated_value)
+                if memory:
+                    memory.put(value, locale, prompt, model, translated_value)
+                print_success(f"{Fore.GREEN}✅ 翻译完成 ({completed}/{total_items}) [{locale}]: {value} -> {translated_value}{Style.RESET_ALL}")
+            else:
+                print_error(f"{Fore.RED}❌ 跳过翻译 ({completed}/{total_items}) [{locale}]: {key}{Style.RESET_ALL}")
 
-    # 保存翻译结果
+    # 所有语言的批次共用一个调度器并发翻译，结果按 diff.json 中的顺序合并
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(en_data, f, ensure_ascii=False, indent=2)
-        print_success(f"{Fore.GREEN}✨ 翻译完成！结果已保存到: {output_file}{Style.RESET_ALL}")
-    except Exception as e:
-        print_error(f"{Fore.RED}❌ 保存文件失败: {str(e)}{Style.RESET_ALL}")
-        sys.exit(1)
+        with create_scheduler(concurrency, rpm, tpm, max_retries) as scheduler:
+            results = scheduler.map(
+                lambda task: translate_batch(task[1], prompt, client, scheduler, model, task[0]),
+                tasks,
+                on_result=on_result,
+            )
+    except BaseException:
+        journal.close()
+        print_info(f"{Fore.YELLOW}💡 已完成的翻译保存在 {journal_file}，可使用 --resume 继续{Style.RESET_ALL}")
+        raise
+    finally:
+        if memory:
+            memory.evict()
+            print_memory_stats(memory)
+            memory.close()
+
+    for (locale, _), batch_results in zip(tasks, results):
+        translated[locale].update(batch_results)
+
+    # 保存翻译结果
+    saved_count = 0
+    for locale in locales:
+        output_file = output_dir / f"diff_{locale}.json"
+        locale_items = ((key, translated[locale][key]) for key, _ in items if translated[locale].get(key))
+        try:
+            saved_count += write_json_items(str(output_file), locale_items)
+            print_success(f"{Fore.GREEN}✨ 翻译完成！结果已保存到: {output_file}{Style.RESET_ALL}")
+        except Exception as e:
+            journal.close()
+            print_error(f"{Fore.RED}❌ 保存文件失败: {str(e)}{Style.RESET_ALL}")
+            sys.exit(1)
+
+    # 所有未跳过的翻译都已写入输出文件，日志不再需要
+    journal.close(remove=saved_count == total_items)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="使用 OpenAI 翻译 build/localizations/diff.json")
+    parser.add_argument('--concurrency', type=int, default=4, help='并发请求数（默认 4）')
+    parser.add_argument('--rpm', type=float, default=None, help='每分钟最大请求数，不填则不限制')
+    parser.add_argument('--tpm', type=float, default=None, help='每分钟最大 token 数，不填则不限制')
+    parser.add_argument('--max-retries', type=int, default=5, help='429/5xx 时的最大重试次数（默认 5）')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help=f'使用的模型（默认 {DEFAULT_MODEL}）')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='每个请求最多打包的键数量，大于 1 时启用批量翻译（默认 1）')
+    parser.add_argument('--batch-token-budget', type=int, default=DEFAULT_BATCH_TOKEN_BUDGET,
+                        help=f'每个批次源文本的估算 token 上限（默认 {DEFAULT_BATCH_TOKEN_BUDGET}）')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用翻译记忆')
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f'翻译记忆最多保留的条目数（默认 {DEFAULT_MAX_ENTRIES}）')
+    parser.add_argument('--cache-max-age-days', type=float, default=DEFAULT_MAX_AGE_DAYS,
+                        help=f'超过该天数未使用的翻译记忆会被淘汰（默认 {DEFAULT_MAX_AGE_DAYS}）')
+    parser.add_argument('--resume', action='store_true',
+                        help='diff.json 未变化时从上次中断处继续，跳过日志中已完成的键')
+    parser.add_argument('--all-locales', action='store_true',
+                        help='翻译 as_i18n.yaml 中的所有语言，分别生成 diff_<语言>.json')
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    process_diff_file() 
\ No newline at end of file
+    process_diff_file(**vars(parse_args()))
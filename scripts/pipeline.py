@@ -0,0 +1,182 @@
+"""
+流水线执行模块
+按依赖关系（DAG）执行步骤：相互独立的步骤并发执行，输入和输出内容未变化的步骤直接跳过，并统计每个步骤的耗时
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from build_manifest import BuildManifest
+from print_utils import print_step, print_info, print_success, print_error
+
+STATUS_RAN = 'ran'
+STATUS_CACHED = 'cached'
+STATUS_SKIPPED = 'skipped'
+STATUS_FAILED = 'failed'
+
+
+@dataclass
+class Step:
+    """
+    流水线中的一个步骤
+
+    Attributes:
+        name: 步骤名称，同时作为依赖引用和状态文件中的键
+        run: 执行函数，接收依赖步骤的结果字典 {步骤名: 结果}，返回值会作为该步骤的结果
+        inputs: 输入文件路径或 glob 模式，没有输入的步骤每次都会执行
+        outputs: 输出文件路径或 glob 模式，任一模式没有匹配到文件或内容被改动时步骤必须重新执行
+        deps: 依赖的步骤名称
+        when: 可选的执行条件，接收依赖结果字典，返回 False 时跳过该步骤及依赖它的步骤
+        description: 打印用的步骤说明
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+    description: str = ''
+
+
+class Pipeline:
+    """
+    基于依赖关系的流水线执行器
+
+    每个步骤执行后，输入、输出文件的内容哈希和步骤结果会记录到构建清单中。下次执行时输入和输出
+    都与清单一致的步骤会被跳过，并复用上次记录的结果。force 为 True 时忽略清单，重新执行所有步骤。
+    """
+
+    def __init__(self, steps: List[Step], manifest_path: str, max_workers: int = 4, force: bool = False):
+        self.steps = {step.name: step for step in steps}
+        self.order = [step.name for step in steps]
+        self.manifest = BuildManifest(manifest_path)
+        self.max_workers = max_workers
+        self.force = force
+        self.timings: Dict[str, float] = {}
+        self.statuses: Dict[str, str] = {}
+        self._validate()
+
+    def _validate(self):
+        """检查依赖是否存在且没有环"""
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"步骤 {step.name} 依赖了不存在的步骤 {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"步骤依赖存在环: {name}")
+            visiting.add(name)
+            for dep in self.steps[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.order:
+            visit(name)
+
+    def _execute(self, step: Step, dep_results: Dict[str, Any]) -> Any:
+        """执行单个步骤，输入和输出都未变化时直接复用上次的结果"""
+        if not self.force and self.manifest.is_up_to_date(step.name, step.inputs, step.outputs):
+            self.statuses[step.name] = STATUS_CACHED
+            print_info(f"[{step.name}] 输入和输出均未变化，跳过")
+            return self.manifest.get_result(step.name)
+
+        print_step(step.name, step.description or step.name)
+        try:
+            result = step.run(dep_results)
+        except BaseException:
+            self.manifest.forget(step.name)
+            self.manifest.save()
+            raise
+        self.statuses[step.name] = STATUS_RAN
+
+        # 步骤可能会修改自己的输入文件（例如原地修复），所以在执行后记录哈希
+        if step.inputs:
+            self.manifest.record(step.name, step.inputs, step.outputs, result)
+            self.manifest.save()
+        return result
+
+    def _timed_execute(self, step: Step, dep_results: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._execute(step, dep_results)
+        finally:
+            self.timings[step.name] = time.perf_counter() - start
+
+    def run(self) -> Dict[str, Any]:
+        """
+        执行整个流水线
+
+        Returns:
+            Dict[str, Any]: 每个已执行（或复用）步骤的结果
+
+        Raises:
+            Exception: 任一步骤失败时，等待正在执行的步骤结束后抛出第一个错误
+        """
+        started_at = time.perf_counter()
+        results: Dict[str, Any] = {}
+        pending = list(self.order)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # 提交所有依赖已完成的步骤；被跳过的步骤可能立即解锁其他步骤，所以循环直到没有新步骤
+                scheduled = error is None
+                while scheduled:
+                    scheduled = False
+                    for name in list(pending):
+                        step = self.steps[name]
+                        if any(dep in pending or dep in running.values() for dep in step.deps):
+                            continue
+                        pending.remove(name)
+                        scheduled = True
+                        dep_results = {dep: results.get(dep) for dep in step.deps}
+                        skipped_dep = any(self.statuses.get(dep) == STATUS_SKIPPED for dep in step.deps)
+                        if skipped_dep or (step.when is not None and not step.when(dep_results)):
+                            self.statuses[name] = STATUS_SKIPPED
+                            print_info(f"[{name}] 条件不满足，跳过")
+                            continue
+                        running[executor.submit(self._timed_execute, step, dep_results)] = name
+
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException as e:
+                        self.statuses[name] = STATUS_FAILED
+                        print_error(f"[{name}] 执行失败: {e}")
+                        if error is None:
+                            error = e
+
+        if error is None:
+            for name in self.order:
+                if self.statuses.get(name) in (STATUS_RAN, STATUS_CACHED):
+                    self.manifest.refresh_outputs(name, self.steps[name].outputs)
+            self.manifest.save()
+
+        self.print_summary(time.perf_counter() - started_at)
+        if error is not None:
+            raise error
+        return results
+
+    def print_summary(self, elapsed: float):
+        """打印每个步骤的状态和耗时"""
+        print_step("SUMMARY", "步骤耗时统计")
+        total = 0.0
+        for name in self.order:
+            status = self.statuses.get(name, 'not run')
+            seconds = self.timings.get(name, 0.0)
+            total += seconds
+            print_info(f"{name:<28} {status:<8} {seconds:8.2f}s")
+        print_success(f"总耗时 {elapsed:.2f}s（步骤累计 {total:.2f}s）")
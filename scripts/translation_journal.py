@@ -0,0 +1,95 @@
+"""
+翻译日志模块
+将完成的翻译逐条追加到 JSON Lines 日志中，中断后可以根据 diff.json 的哈希恢复进度
+"""
+
+import hashlib
+import os
+from typing import Dict
+
+import json_codec
+
+
+def file_sha256(file_path: str) -> str:
+    """计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranslationJournal:
+    """
+    追加写入的翻译日志
+
+    第一行记录 diff.json 的哈希，之后每行是一条 {"locale", "key", "value"}。
+    每写入一条都会 flush，进程崩溃时最多丢失正在进行中的请求。
+    """
+
+    def __init__(self, journal_path: str, diff_hash: str, resume: bool = False):
+        self.journal_path = journal_path
+        self.diff_hash = diff_hash
+        self.entries: Dict[str, Dict[str, str]] = {}
+        # 日志中完整有效部分的字节数，继续写入前截断到这里
+        self._valid_size = 0
+
+        if resume:
+            self.entries = self._load()
+        if self.entries:
+            # 去掉中断时写了一半的行，否则新追加的记录会接在它后面
+            os.truncate(journal_path, self._valid_size)
+            self.file = open(journal_path, 'a', encoding='utf-8')
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+            self.file = open(journal_path, 'w', encoding='utf-8')
+            self._write_line({'diff_hash': diff_hash})
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """读取已有日志，diff.json 哈希不一致时丢弃；遇到不完整或无法解析的行时只保留它之前的记录"""
+        if not os.path.exists(self.journal_path):
+            return {}
+
+        entries: Dict[str, Dict[str, str]] = {}
+        with open(self.journal_path, 'rb') as f:
+            header_line = f.readline()
+            try:
+                header = json_codec.loads(header_line)
+            except ValueError:
+                return {}
+            if not header_line.endswith(b'\n') or not isinstance(header, dict) \
+                    or header.get('diff_hash') != self.diff_hash:
+                return {}
+            valid_size = len(header_line)
+            for line in f:
+                # 最后一行可能在写入时被中断：没有换行符或者不是有效的 JSON
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json_codec.loads(line)
+                    entries.setdefault(record['locale'], {})[record['key']] = record['value']
+                except (ValueError, KeyError, TypeError):
+                    break
+                valid_size += len(line)
+        self._valid_size = valid_size
+        return entries
+
+    def _write_line(self, record: dict):
+        self.file.write(json_codec.dumps_compact(record) + '\n')
+        self.file.flush()
+
+    def get(self, locale: str) -> Dict[str, str]:
+        """获取某个语言已完成的翻译"""
+        return self.entries.get(locale, {})
+
+    def record(self, locale: str, key: str, value: str):
+        """追加一条完成的翻译"""
+        self.entries.setdefault(locale, {})[key] = value
+        self._write_line({'locale': locale, 'key': key, 'value': value})
+
+    def close(self, remove: bool = False):
+        """关闭日志，remove 为 True 时删除日志文件（整个任务成功完成后）"""
+        self.file.close()
+        if remove and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
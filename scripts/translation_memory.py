@@ -0,0 +1,120 @@
+"""
+翻译记忆模块
+基于 SQLite 的持久化翻译缓存，以 (源文本, 目标语言, 提示词, 模型) 的哈希作为键
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_AGE_DAYS = 180
+
+
+def translation_key(text: str, locale: str, prompt: str, model: str) -> str:
+    """计算一条翻译的内容寻址键"""
+    digest = hashlib.sha256()
+    for part in (text, locale, prompt, model):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class TranslationMemory:
+    """
+    持久化翻译记忆
+
+    查询命中时刷新 last_used_at，调用 evict() 按最长未使用时间和最大条目数淘汰旧记录。
+    同一实例只应在一个线程中使用。
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            ' key TEXT PRIMARY KEY,'
+            ' source TEXT NOT NULL,'
+            ' locale TEXT NOT NULL,'
+            ' model TEXT NOT NULL,'
+            ' translation TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' last_used_at REAL NOT NULL)'
+        )
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_translations_last_used_at ON translations (last_used_at)'
+        )
+        self.conn.commit()
+
+    def get(self, text: str, locale: str, prompt: str, model: str) -> Optional[str]:
+        """查询翻译记忆，未命中返回 None"""
+        key = translation_key(text, locale, prompt, model)
+        row = self.conn.execute('SELECT translation FROM translations WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute('UPDATE translations SET last_used_at = ? WHERE key = ?', (time.time(), key))
+        self.conn.commit()
+        return row[0]
+
+    def put(self, text: str, locale: str, prompt: str, model: str, translation: str):
+        """写入一条翻译"""
+        now = time.time()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO translations'
+            ' (key, source, locale, model, translation, created_at, last_used_at)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (translation_key(text, locale, prompt, model), text, locale, model, translation, now, now),
+        )
+        self.conn.commit()
+        self.writes += 1
+
+    def evict(self) -> int:
+        """按最长未使用时间和最大条目数淘汰记录，返回删除的条数"""
+        removed = 0
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += self.conn.execute(
+                'DELETE FROM translations WHERE last_used_at < ?', (cutoff,)
+            ).rowcount
+        if self.max_entries:
+            count = self.conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                removed += self.conn.execute(
+                    'DELETE FROM translations WHERE key IN ('
+                    ' SELECT key FROM translations ORDER BY last_used_at ASC LIMIT ?)',
+                    (overflow,),
+                ).rowcount
+        self.conn.commit()
+        self.evicted += removed
+        return removed
+
+    def size(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,193 @@
+"""
+翻译请求调度模块
+提供令牌桶限流（RPM/TPM）、指数退避重试以及基于线程池的并发执行
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, List, Optional
+
+# 需要重试的 HTTP 状态码（限流和服务端错误）
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶
+
+    以每分钟 rate_per_minute 个令牌的速度匀速补充，桶容量等于每分钟的配额。
+    rate_per_minute 为 None 或 0 时不做限制。
+    """
+
+    def __init__(self, rate_per_minute: Optional[float]):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = float(rate_per_minute or 0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / 60.0)
+
+    def acquire(self, amount: float = 1):
+        """获取 amount 个令牌，不足时阻塞等待"""
+        if not self.rate_per_minute:
+            return
+
+        # 单次请求超过桶容量时按满桶处理，避免永远等待
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait_seconds = (amount - self.tokens) * 60.0 / self.capacity
+            time.sleep(wait_seconds)
+
+
+class RateLimiter:
+    """同时按请求数（RPM）和 token 数（TPM）限流"""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.request_bucket = TokenBucket(rpm)
+        self.token_bucket = TokenBucket(tpm)
+
+    def acquire(self, tokens: int = 0):
+        self.request_bucket.acquire(1)
+        if tokens:
+            self.token_bucket.acquire(tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数量
+
+    非 ASCII 字符（中文等）按每个字符 1 个 token 计算，ASCII 字符按每 4 个字符 1 个 token 计算。
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return non_ascii + (ascii_count + 3) // 4
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """从异常中提取 HTTP 状态码"""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        response = getattr(error, 'response', None)
+        status_code = getattr(response, 'status_code', None)
+    return status_code
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """判断异常是否值得重试：限流、服务端错误以及网络连接/超时错误"""
+    status_code = get_status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """读取响应中的 Retry-After 头（秒）"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TranslationScheduler:
+    """
+    翻译请求调度器
+
+    所有请求共享同一个线程池和限流器，失败的请求按指数退避（带随机抖动）重试。
+    多个语言或多个批次可以共用一个调度器，使总并发和总配额保持在限制之内。
+    """
+
+    def __init__(self,
+                 concurrency: int = 4,
+                 rpm: Optional[float] = None,
+                 tpm: Optional[float] = None,
+                 max_retries: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0,
+                 is_retryable: Callable[[Exception], bool] = is_retryable_error):
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(rpm, tpm)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_retryable = is_retryable
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """计算第 attempt 次重试前的等待时间"""
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def call(self, func: Callable[[], Any], estimated_tokens: int = 0) -> Any:
+        """在限流和重试策略下执行一次请求"""
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(estimated_tokens)
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                time.sleep(self.backoff_delay(attempt, e))
+                attempt += 1
+
+    def map(self,
+            func: Callable[[Any], Any],
+            items: Iterable[Any],
+            on_result: Optional[Callable[[int, Any, Any], None]] = None) -> List[Any]:
+        """
+        并发地对 items 中的每一项执行 func
+
+        Args:
+            func: 处理单个元素的函数，内部通常会调用 self.call
+            items: 待处理的元素
+            on_result: 每完成一项时在调用线程中回调 (index, item, result)
+
+        Returns:
+            List[Any]: 与 items 顺序一致的结果列表
+        """
+        items = list(items)
+        results = [None] * len(items)
+        futures = {self.executor.submit(func, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_result:
+                on_result(index, items[index], results[index])
+        return results
+
+    def shutdown(self, cancel_pending: bool = False):
+        """
+        关闭线程池并等待正在执行的任务结束
+
+        Args:
+            cancel_pending: 是否取消还没有开始执行的任务（出错或 Ctrl-C 时不再发出新的请求）
+        """
+        self.executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_pending=exc_type is not None)
@@ -1,20 +1,34 @@
+import argparse
 import os
 import re
 import subprocess
-import json
 import sys
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 导入配置工具模块
-from config_utils import get_project_root
+from config_utils import (
+    get_config_path,
+    get_i18n_dir,
+    get_locales,
+    get_output_localization_file,
+    get_project_root,
+    get_template_json_file,
+)
 
 # 获取项目根目录
 project_root = get_project_root()
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from print_utils import print_step, print_info, print_success, print_error
+from print_utils import print_info, print_success, print_error
+import json_codec
+from arb_merge import DEFAULT_WORKERS, describe_conflict, merge_arb_file_list
+from json_stream import write_json_items
+from key_index import CoverageMatrix, KeyIndex
+from lingo_snapshot import SNAPSHOT_PATH
+from pipeline import Pipeline, Step
 from colorama import init, Fore, Style
 
 # 初始化 colorama
@@ -34,7 +48,26 @@ def ensure_output_dir():
     os.makedirs(output_dir, exist_ok=True)
     return output_dir
 
+# 输出中最多列出的冲突键数
+MAX_PRINTED_CONFLICTS = 20
+
+# diff.json 对应的源语言
+SOURCE_LOCALE = 'zh_Hans_CN'
+
+# 各语言缺失文案和汇总矩阵的输出目录（相对 build/localizations）。
+# 不直接放在 build/localizations 下，避免与 openai_translate 输出的 diff_<语言>.json 混在一起
+LOCALE_DIFFS_DIR = 'locale_diffs'
+
 def merge_arb_files():
+    """
+    合并 build/localizations/arb 下的所有 arb 文件
+
+    文件按文件名顺序在线程池中解析并合并，同一个键在多个文件中取值不同时会报告冲突，
+    后面的文件生效。
+
+    Returns:
+        MergedArb: 合并视图（可以像 dict 一样查询，并能查到每个键的来源文件），失败时返回 None
+    """
     try:
         # 获取所有 arb 文件
         arb_files = glob.glob(os.path.join(project_root, 'build/localizations/arb/*.arb'))
@@ -43,47 +76,138 @@ def merge_arb_files():
             return None
 
         # 合并所有 arb 文件
-        merged_data = {}
-        for arb_file in arb_files:
-            with open(arb_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                merged_data.update(data)
-        
-        print_success(f"成功合并了 {len(arb_files)} 个 arb 文件")
+        merged_data = merge_arb_file_list(arb_files)
+
+        print_success(f"成功合并了 {len(arb_files)} 个 arb 文件，共 {len(merged_data)} 个键")
+        if merged_data.conflicts:
+            conflicts = list(merged_data.conflicts.values())
+            print_error(f"有 {len(conflicts)} 个键在多个 arb 文件中的值不同:")
+            for conflict in conflicts[:MAX_PRINTED_CONFLICTS]:
+                print_error(f"  {describe_conflict(conflict)}")
+            if len(conflicts) > MAX_PRINTED_CONFLICTS:
+                print_error(f"  ... 另外 {len(conflicts) - MAX_PRINTED_CONFLICTS} 个")
         return merged_data
     except Exception as e:
         print_error(f"合并 arb 文件时出错: {e}")
         return None
 
+def load_locale_arbs(translations_dir, locales, max_workers=DEFAULT_WORKERS):
+    """
+    在线程池中读取 get_locales() 中每种语言的 intl_<locale>.arb
+
+    Returns:
+        Dict[str, dict]: 语言代码 -> ARB 数据，文件不存在的语言为 None
+    """
+    def load(locale):
+        file_path = os.path.join(translations_dir, f"intl_{locale}.arb")
+        if not os.path.exists(file_path):
+            return None
+        return json_codec.load_file(file_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(locales, executor.map(load, locales)))
+
+def compute_locale_diffs(merged_messages, locale_arbs):
+    """
+    在一个键索引上计算每种语言缺失的键和过期的键
+
+    源文案（合并后的 arb）的键先驻留，ID 为 0..n-1，源位图即全部低 n 位；每种语言的 ARB 只转换一次位图，
+    缺失 = 源位图 & ~语言位图，过期（ARB 中有但源文案中已经没有）= 语言位图 & ~源位图。
+
+    Returns:
+        Tuple[Dict[str, List[str]], Dict[str, List[str]]]: 每种语言缺失的键（按合并顺序）和过期的键
+    """
+    coverage = CoverageMatrix(KeyIndex(merged_messages))
+    source_mask = coverage.index.full_mask()
+    missing = {}
+    stale = {}
+    for locale, arb_data in locale_arbs.items():
+        coverage.add(locale, (key for key in arb_data or () if not key.startswith('@')))
+        missing[locale] = coverage.missing_keys(locale, source_mask)
+        stale[locale] = coverage.index.keys_from_mask(coverage.masks[locale] & ~source_mask)
+    return missing, stale
+
+def write_locale_diffs(merged_messages, missing, stale):
+    """
+    写入每种语言的缺失文案 locale_diffs/diff_<locale>.json 和汇总矩阵 locale_diffs/summary.json
+
+    上次运行留下的、本次没有对应语言的 diff 文件会被删除。
+    """
+    diffs_dir = os.path.join(ensure_output_dir(), LOCALE_DIFFS_DIR)
+    os.makedirs(diffs_dir, exist_ok=True)
+
+    written = set()
+    for locale, keys in missing.items():
+        file_name = f"diff_{locale}.json"
+        write_json_items(os.path.join(diffs_dir, file_name), ((key, merged_messages[key]) for key in keys))
+        written.add(file_name)
+    for file_name in os.listdir(diffs_dir):
+        if file_name.startswith('diff_') and file_name.endswith('.json') and file_name not in written:
+            os.remove(os.path.join(diffs_dir, file_name))
+
+    total = len(merged_messages)
+    summary = {
+        'source_keys': total,
+        'locales': {
+            locale: {
+                'present': total - len(missing[locale]),
+                'missing': len(missing[locale]),
+                'stale': len(stale[locale]),
+                'completion': (total - len(missing[locale])) / total if total else 1.0,
+            }
+            for locale in missing
+        },
+        'stale_keys': {locale: keys for locale, keys in stale.items() if keys},
+    }
+    json_codec.write_file(os.path.join(diffs_dir, 'summary.json'), summary)
+    return diffs_dir
+
+def print_locale_summary(missing, stale, source_count):
+    """打印每种语言的缺失和过期数量"""
+    for locale in missing:
+        print_info(f"{locale:<12} 缺失 {len(missing[locale]):>6} / {source_count}，过期 {len(stale[locale]):>6}")
+
 def compare_arb_files():
+    """
+    对比合并后的 arb 与每种语言的翻译
+
+    为 get_locales() 中的每种语言计算缺失的键和过期的键，写入 build/localizations/locale_diffs；
+    源语言缺失的键同时写入 diff.json（没有缺失时为空对象），作为后续翻译步骤的输入。
+
+    Returns:
+        bool: 源语言是否有缺失的翻译
+    """
     try:
         # 合并临时 arb 文件
         merged_messages = merge_arb_files()
         if not merged_messages:
             return False
 
-        # 读取现有的中文翻译文件
-        with open(os.path.join(project_root, 'assets/translations/intl_zh_Hans_CN.arb'), 'r', encoding='utf-8') as f:
-            zh_cn = json.load(f)
-        
-        # 找出缺失的key
-        missing_keys = set(merged_messages.keys()) - set(zh_cn.keys())
-        
+        # 读取所有语言的翻译文件
+        locales = get_locales()
+        if SOURCE_LOCALE not in locales:
+            locales = [SOURCE_LOCALE] + locales
+        locale_arbs = load_locale_arbs(os.path.join(project_root, 'assets/translations'), locales)
+        if locale_arbs[SOURCE_LOCALE] is None:
+            raise FileNotFoundError(f"找不到 intl_{SOURCE_LOCALE}.arb")
+        for locale, arb_data in locale_arbs.items():
+            if arb_data is None:
+                print_info(f"intl_{locale}.arb 不存在，按全部缺失处理")
+
+        # 在同一个键索引上计算所有语言的缺失和过期键
+        missing, stale = compute_locale_diffs(merged_messages, locale_arbs)
+        diffs_dir = write_locale_diffs(merged_messages, missing, stale)
+        print_locale_summary(missing, stale, len(merged_messages))
+        print_success(f"已生成各语言的差异文件和汇总矩阵到 {diffs_dir}")
+
+        # 源语言缺失的键写入 diff.json；没有缺失时写入空对象，避免后续步骤读到上次遗留的 diff.json
+        missing_keys = missing[SOURCE_LOCALE]
+        diff_data = {key: merged_messages[key] for key in missing_keys}
+        diff_path = os.path.join(ensure_output_dir(), 'diff.json')
+        json_codec.write_file(diff_path, diff_data)
+
         if missing_keys:
             print_info(f"找到 {len(missing_keys)} 个缺失的翻译")
-            
-            # 构建diff数据
-            diff_data = {}
-            for key in missing_keys:
-                diff_data[key] = merged_messages[key]
-            
-            # 确保输出目录存在
-            output_dir = ensure_output_dir()
-            
-            # 写入diff.json
-            diff_path = os.path.join(output_dir, 'diff.json')
-            with open(diff_path, 'w', encoding='utf-8') as f:
-                json.dump(diff_data, f, indent=2, ensure_ascii=False)
             print_success(f"已生成 diff.json 到 {diff_path}")
             return True
         else:
@@ -134,7 +258,141 @@ def check_and_install_lingo(sdk_dir):
         os.chdir(original_dir)
 
 
+def build_pipeline_steps(localizations_sdk_dir):
+    """
+    构建导出翻译差异的流水线步骤
+
+    Dart 步骤通过 dart run 执行，Python 步骤在当前进程内直接调用。
+    generate 与 create_not_exist_arb 相互独立，会并发执行。
+    """
+    scripts_dir = os.path.join(localizations_sdk_dir, 'scripts')
+    output_dir = os.path.join(project_root, 'build', 'localizations')
+    translations_dir = os.path.join(project_root, 'assets', 'translations')
+    i18n_dir = os.path.join(project_root, get_i18n_dir())
+    strings_dir = os.path.join(i18n_dir, 'strings')
+    config_path = get_config_path()
+
+    def dart_step(script):
+        def run(_):
+            run_command(f"dart run ./scripts/{script}", cwd=localizations_sdk_dir)
+        return run
+
+    def run_compare(_):
+        return compare_arb_files()
+
+    def run_openai_translate(_):
+        try:
+            import openai_translate
+        except ImportError:
+            # 当前解释器没有安装 openai 时退回到虚拟环境中执行
+            venv_python = get_venv_python()
+            run_command(f"{venv_python} ./scripts/openai_translate.py", cwd=localizations_sdk_dir)
+            return
+        openai_translate.process_diff_file()
+
+    def run_diff_to_lingo(_):
+        import diff_to_lingo
+        diff_to_lingo.main([])
+
+    return [
+        Step(
+            name='generate',
+            description='Generate _strings.dart',
+            run=dart_step('generate.dart'),
+            inputs=[
+                config_path,
+                os.path.join(i18n_dir, get_template_json_file()),
+                os.path.join(scripts_dir, 'generate.dart'),
+                os.path.join(scripts_dir, 'config_parser.dart'),
+            ],
+            outputs=[
+                os.path.join(strings_dir, '*_strings.dart'),
+                os.path.join(i18n_dir, get_output_localization_file()),
+            ],
+        ),
+        Step(
+            name='create_not_exist_arb',
+            description='Create not exist arb files',
+            run=dart_step('create_not_exist_arb.dart'),
+            inputs=[
+                config_path,
+                os.path.join(translations_dir, 'intl_*.arb'),
+                os.path.join(scripts_dir, 'create_not_exist_arb.dart'),
+            ],
+            outputs=[os.path.join(translations_dir, 'intl_list.txt')],
+        ),
+        Step(
+            name='check_and_fix_sid',
+            description='Check Sid',
+            run=dart_step('check_and_fix_sid.dart'),
+            deps=['generate'],
+            inputs=[
+                config_path,
+                os.path.join(strings_dir, '**', '*_strings.dart'),
+                os.path.join(scripts_dir, 'check_and_fix_sid.dart'),
+            ],
+        ),
+        Step(
+            name='generate_new_strings',
+            description='Generate new *_strings.dart',
+            run=dart_step('generate_new_strings.dart'),
+            deps=['check_and_fix_sid'],
+            inputs=[
+                config_path,
+                os.path.join(strings_dir, '*_strings.dart'),
+                os.path.join(scripts_dir, 'generate_new_strings.dart'),
+            ],
+            outputs=[os.path.join(output_dir, 'arb', '*.arb')],
+        ),
+        Step(
+            name='compare',
+            description='Compare locale ARBs to diff.json and locale_diffs',
+            run=run_compare,
+            deps=['generate_new_strings', 'create_not_exist_arb'],
+            inputs=[
+                config_path,
+                os.path.join(output_dir, 'arb', '*.arb'),
+                os.path.join(translations_dir, 'intl_*.arb'),
+            ],
+            outputs=[
+                os.path.join(output_dir, 'diff.json'),
+                os.path.join(output_dir, LOCALE_DIFFS_DIR, 'summary.json'),
+            ],
+        ),
+        Step(
+            name='openai_translate',
+            description='OpenAI Translate',
+            run=run_openai_translate,
+            deps=['compare'],
+            when=lambda results: bool(results['compare']),
+            inputs=[
+                os.path.join(output_dir, 'diff.json'),
+                os.path.join(scripts_dir, 'prompt.txt'),
+            ],
+            outputs=[os.path.join(output_dir, 'diff_en_US.json')],
+        ),
+        Step(
+            name='diff_to_lingo',
+            description='Export lingo json file',
+            run=run_diff_to_lingo,
+            deps=['openai_translate'],
+            inputs=[
+                config_path,
+                os.path.join(output_dir, 'diff*.json'),
+                os.path.join(localizations_sdk_dir, 'lingo-sync', 'src', 'locales', '*.js'),
+                os.path.join(project_root, SNAPSHOT_PATH),
+            ],
+            outputs=[os.path.join(output_dir, 'new_to_lingo.json')],
+        ),
+    ]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="导出需要翻译的差异文件 build/localizations/diff.json")
+    parser.add_argument('--force', action='store_true', help='忽略构建清单，重新执行所有步骤')
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
     try:
         localizations_sdk_dir = str(Path(__file__).parent.parent)
 
@@ -146,34 +404,15 @@ def main():
         os.makedirs(os.path.join(output_dir, "arb"), exist_ok=True)
         os.makedirs("assets/translations", exist_ok=True)
 
-        print_step("Step 1", "Generate _strings.dart")
-        run_command("dart run ./scripts/generate.dart", cwd=localizations_sdk_dir)
-
-        print_step("Step 2", "Generate _strings.dart")
-        run_command("dart run ./scripts/generate.dart", cwd=localizations_sdk_dir)
-
-        print_step("Step 3", "Create not exist arb files")
-        run_command("dart run ./scripts/create_not_exist_arb.dart", cwd=localizations_sdk_dir)
-
-        print_step("Step 4", "Check Sid")
-        run_command("dart run ./scripts/check_and_fix_sid.dart", cwd=localizations_sdk_dir)
+        pipeline = Pipeline(
+            build_pipeline_steps(localizations_sdk_dir),
+            manifest_path=os.path.join(output_dir, 'build_manifest.json'),
+            force=args.force,
+        )
+        results = pipeline.run()
 
-
-        print_step("Step 5", "Generate new *_strings.dart")
-        run_command("dart run ./scripts/generate_new_strings.dart", cwd=localizations_sdk_dir)
-
-        print_step("Step 6", "Compare zh_CN ARB to diff.json")
-        has_missing_translations = compare_arb_files()
-
-        if has_missing_translations:
-            print_step("Step 7", "OpenAI Translate")
-            venv_python = get_venv_python()
-            run_command(f"{venv_python} ./scripts/openai_translate.py", cwd=localizations_sdk_dir)
-                
-            print_step("Step 8", "Export lingo json file")
-            run_command(f"{venv_python} ./scripts/diff_to_lingo.py", cwd=localizations_sdk_dir)
-        else:
-            print_info("没有需要翻译的内容，跳过步骤 7 和 8")
+        if not results.get('compare'):
+            print_info("没有需要翻译的内容，跳过翻译和导出步骤")
 
     except Exception as e:
         print_error(f"执行过程中出错: {e}")
@@ -1,8 +1,12 @@
+import argparse
 import os
 import json
 import glob
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 # 添加项目根目录到 Python 路径
 from config_utils import get_project_root
@@ -10,34 +14,120 @@ project_root = get_project_root()
 if project_root not in sys.path:
     sys.path.append(project_root)
 
+import json_codec
 from print_utils import print_step, print_info, print_success, print_error
+from key_index import CoverageMatrix
+from icu_message import ICUSyntaxError, parse_signature, placeholder_names
+
+# 占位符一致性检查以该语言的文案为准
+SOURCE_LOCALE = 'zh_Hans_CN'
+
+# 缺失键在终端中最多打印的数量，完整列表通过覆盖矩阵导出
+MAX_PRINTED_MISSING_KEYS = 20
+
+
+@dataclass
+class Finding:
+    """一条验证问题"""
+    file_path: str
+    kind: str
+    message: str
+    key: Optional[str] = None
+
+
+@dataclass
+class ArbFileResult:
+    """单个 ARB 文件的处理结果"""
+    file_path: str
+    locale: Optional[str] = None
+    keys: List[str] = field(default_factory=list)
+    findings: List[Finding] = field(default_factory=list)
+    modified: bool = False
+    readable: bool = True
+    # 含占位符的键 -> 占位符签名，用于跨语言的一致性检查
+    signatures: Dict[str, Tuple[Tuple[str, str], ...]] = field(default_factory=dict)
+
+
+@dataclass
+class ValidationResult:
+    """所有 ARB 文件的验证结果"""
+    files: List[ArbFileResult] = field(default_factory=list)
+    findings: List[Finding] = field(default_factory=list)
+    coverage: Optional[CoverageMatrix] = None
+
+    @property
+    def error_count(self) -> int:
+        return len(self.findings)
+
+    @property
+    def ok(self) -> bool:
+        return not self.findings
+
+
+def sort_arb_data(data):
+    """返回排序后的 ARB 数据：@@locale 在第一行，其他键值对按 key 排序"""
+    sorted_data = {}
+    if '@@locale' in data:
+        sorted_data['@@locale'] = data['@@locale']
+    for key in sorted(data.keys()):
+        if key != '@@locale':
+            sorted_data[key] = data[key]
+    return sorted_data
+
+
+def serialize_arb_data(data):
+    """按项目统一格式序列化 ARB 数据（两空格缩进，末尾换行），返回 UTF-8 字节串"""
+    return json_codec.dumps_bytes(data) + b'\n'
+
+
+def write_arb_file_if_changed(file_path, data, original_content):
+    """
+    只有内容变化时才写入 ARB 文件
+
+    写入时先写临时文件再重命名，避免中断时留下不完整的文件。未变化的文件不会被触碰，
+    修改时间保持不变，不会让 gen-l10n 和 IDE 的缓存失效。
+
+    Returns:
+        bool: 是否写入了文件
+    """
+    content = serialize_arb_data(data)
+    if content == original_content:
+        return False
+
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
+
 
 def sort_arb_file(file_path):
-    """对 ARB 文件进行排序，保持 @@locale 在第一行，其他键值对按 key 排序"""
+    """
+    对 ARB 文件进行排序，保持 @@locale 在第一行，其他键值对按 key 排序
+
+    Returns:
+        bool: 文件是否被修改
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 保存 @@locale
-        locale = data.pop('@@locale', None)
+        with open(file_path, 'rb') as f:
+            original_content = f.read()
+        data = json_codec.loads(original_content)
         
-        # 创建新的有序字典
-        sorted_data = {}
-        if locale is not None:
-            sorted_data['@@locale'] = locale
+        # 只在顺序或格式变化时写回文件
+        modified = write_arb_file_if_changed(file_path, sort_arb_data(data), original_content)
         
-        # 按 key 排序并添加其他键值对
-        for key in sorted(data.keys()):
-            sorted_data[key] = data[key]
-        
-        # 写回文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(sorted_data, f, ensure_ascii=False, indent=2)
-            f.write('\n')  # 添加最后的换行符
-        
-        print_success(f"文件 {os.path.basename(file_path)} 排序完成")
+        if modified:
+            print_success(f"文件 {os.path.basename(file_path)} 排序完成")
+        else:
+            print_info(f"文件 {os.path.basename(file_path)} 已是有序状态，无需写入")
+        return modified
     except Exception as e:
         print_error(f"排序文件 {file_path} 时出错: {e}")
+        return False
 
 def sort_all_arb_files():
     """对所有 ARB 文件进行排序"""
@@ -48,16 +138,217 @@ def sort_all_arb_files():
             return
 
         print_info(f"开始对 {len(arb_files)} 个 ARB 文件进行排序")
-        for arb_file in arb_files:
-            sort_arb_file(arb_file)
+        modified_count = sum(1 for arb_file in arb_files if sort_arb_file(arb_file))
         
-        print_success("所有文件排序完成")
+        print_success(f"所有文件排序完成，实际修改了 {modified_count} 个文件")
     except Exception as e:
         print_error(f"排序过程中出错: {e}")
 
-def validate_arb_files():
-    """验证所有 ARB 文件"""
-    error_count = 0
+
+def validate_arb_data(file_path, data, signatures=None):
+    """
+    检查单个 ARB 文件内部的问题：@@locale、值类型和 ICU 占位符格式
+
+    signatures 不为 None 时，会把每个含占位符的键的签名写入其中。
+    """
+    findings = []
+    if '@@locale' not in data:
+        findings.append(Finding(file_path, 'missing_locale', f"文件 {file_path} 缺少 @@locale 字段"))
+
+    for key, value in data.items():
+        if key.startswith('@'):  # 跳过元数据
+            continue
+
+        if not isinstance(value, str):
+            findings.append(Finding(file_path, 'non_string', f"键 {key} 的值不是字符串类型", key))
+            continue
+
+        # 按 ICU MessageFormat 解析占位符（包括 plural / select 的参数）
+        try:
+            signature = parse_signature(value)
+        except ICUSyntaxError as e:
+            findings.append(Finding(file_path, 'icu_syntax', f"键 {key} 的 ICU 消息格式错误: {e}", key))
+            continue
+        if not signature:
+            continue
+
+        for placeholder in placeholder_names(signature):
+            if not placeholder.isalnum() and not placeholder.startswith('_'):
+                findings.append(Finding(file_path, 'invalid_placeholder',
+                                        f"键 {key} 包含无效的占位符: {placeholder}", key))
+        if signatures is not None:
+            signatures[key] = signature
+    return findings
+
+
+def syntax_error_keys(file_result):
+    """ICU 消息格式错误的键"""
+    return {finding.key for finding in file_result.findings if finding.kind == 'icu_syntax'}
+
+
+def check_placeholder_consistency(files, source_locale=SOURCE_LOCALE):
+    """
+    检查每种语言的译文与源语言文案的占位符名称集合是否一致
+
+    源文案的签名在工作进程中已经解析好，这里只按键比较名称集合。两边都没有占位符的键不需要比较，
+    ICU 格式错误的键已经单独报告，也不再比较。
+    plural / select 等参数类型允许不同（例如中文用 {count}，英文用 {count, plural, ...}）。
+
+    Returns:
+        List[Finding]: 占位符不一致的问题
+    """
+    source = next((f for f in files if f.locale == source_locale), None)
+    if source is None:
+        return []
+
+    source_keys = set(source.keys) - syntax_error_keys(source)
+    source_names = {key: set(placeholder_names(sig)) for key, sig in source.signatures.items()}
+    findings = []
+    for file_result in files:
+        if file_result is source or file_result.locale is None:
+            continue
+        file_keys = set(file_result.keys) - syntax_error_keys(file_result)
+        candidates = (source_names.keys() | file_result.signatures.keys()) & source_keys & file_keys
+        for key in sorted(candidates):
+            expected = source_names.get(key, set())
+            actual = set(placeholder_names(file_result.signatures.get(key, ())))
+            if expected == actual:
+                continue
+            details = []
+            if expected - actual:
+                details.append("缺少 " + ", ".join(f"{{{name}}}" for name in sorted(expected - actual)))
+            if actual - expected:
+                details.append("多出 " + ", ".join(f"{{{name}}}" for name in sorted(actual - expected)))
+            findings.append(Finding(file_result.file_path, 'placeholder_mismatch',
+                                    f"键 {key} 的占位符与 {source_locale} 不一致: {'，'.join(details)}", key))
+    return findings
+
+
+def process_arb_file(file_path, sort=False):
+    """
+    读取一次 ARB 文件，可选地排序（仅在有变化时写回），并完成文件内部的验证
+
+    在进程池中执行，返回可序列化的 ArbFileResult。
+    """
+    result = ArbFileResult(file_path)
+    try:
+        with open(file_path, 'rb') as f:
+            original_content = f.read()
+        data = json_codec.loads(original_content)
+    except json.JSONDecodeError:
+        result.readable = False
+        result.findings.append(Finding(file_path, 'invalid_json', f"文件 {file_path} 不是有效的 JSON 格式"))
+        return result
+    except Exception as e:
+        result.readable = False
+        result.findings.append(Finding(file_path, 'read_error', f"读取文件 {file_path} 时出错: {e}"))
+        return result
+
+    if sort:
+        try:
+            result.modified = write_arb_file_if_changed(file_path, sort_arb_data(data), original_content)
+        except Exception as e:
+            result.findings.append(Finding(file_path, 'write_error', f"排序文件 {file_path} 时出错: {e}"))
+
+    result.locale = data.get('@@locale')
+    result.keys = [k for k in data.keys() if not k.startswith('@')]
+    result.findings.extend(validate_arb_data(file_path, data, result.signatures))
+    return result
+
+
+def coverage_label(file_result):
+    """覆盖矩阵中使用的列名：优先使用 @@locale，缺失时使用文件名"""
+    return file_result.locale or os.path.basename(file_result.file_path)
+
+
+def run_arb_engine(arb_files, sort=False, max_workers=None):
+    """
+    在进程池中并行处理所有 ARB 文件，再做跨文件的缺失键和占位符一致性检查
+
+    Returns:
+        ValidationResult: 所有文件的结构化验证结果
+    """
+    arb_files = sorted(arb_files)
+    if len(arb_files) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            files = list(executor.map(process_arb_file, arb_files, [sort] * len(arb_files)))
+    else:
+        files = [process_arb_file(arb_file, sort) for arb_file in arb_files]
+
+    result = ValidationResult(files=files)
+    for file_result in files:
+        result.findings.extend(file_result.findings)
+
+    # 文件读取失败时不再做跨文件检查
+    if any(not file_result.readable for file_result in files):
+        return result
+
+    # 用键索引和每个文件的位图检查是否缺少其他文件中的键
+    coverage = CoverageMatrix()
+    for file_result in files:
+        coverage.add(coverage_label(file_result), file_result.keys)
+    result.coverage = coverage
+
+    union = coverage.union_mask()
+    for file_result in files:
+        if file_result.locale is None:
+            continue
+        missing_keys = coverage.missing_keys(coverage_label(file_result), union)
+        if missing_keys:
+            shown = missing_keys[:MAX_PRINTED_MISSING_KEYS]
+            message = f"文件 {file_result.file_path} 缺少 {len(missing_keys)} 个键:\n" + ",\n".join(shown)
+            if len(missing_keys) > len(shown):
+                message += f"\n... 其余 {len(missing_keys) - len(shown)} 个键请导出覆盖矩阵查看"
+            finding = Finding(file_result.file_path, 'missing_keys', message)
+            file_result.findings.append(finding)
+            result.findings.append(finding)
+
+    files_by_path = {file_result.file_path: file_result for file_result in files}
+    for finding in check_placeholder_consistency(files):
+        files_by_path[finding.file_path].findings.append(finding)
+        result.findings.append(finding)
+    return result
+
+
+def print_coverage_summary(coverage):
+    """打印每种语言的翻译完成度"""
+    print_step("覆盖率", f"共 {len(coverage.index)} 个键")
+    for locale, stats in coverage.summary().items():
+        print_info(f"{locale:<16} {stats['completion']:7.2%}  缺少 {stats['missing']} 个键")
+
+
+def export_coverage(coverage, coverage_json=None, coverage_csv=None):
+    """导出语言 × 键的覆盖矩阵"""
+    if coverage_json:
+        coverage.export_json(coverage_json)
+        print_success(f"覆盖矩阵已导出到: {coverage_json}")
+    if coverage_csv:
+        coverage.export_csv(coverage_csv)
+        print_success(f"覆盖矩阵已导出到: {coverage_csv}")
+
+
+def report_validation_result(result):
+    """打印验证结果，返回是否全部通过"""
+    for file_result in result.files:
+        print_step("验证", f"正在验证文件: {os.path.basename(file_result.file_path)}")
+        for finding in file_result.findings:
+            print_error(finding.message)
+        if not file_result.findings:
+            print_success(f"文件 {os.path.basename(file_result.file_path)} 验证通过")
+
+    if result.ok:
+        print_success("所有文件验证通过")
+    else:
+        print_error(f"验证失败：发现 {result.error_count} 个错误")
+    return result.ok
+
+
+def validate_arb_files(sort=False, coverage_json=None, coverage_csv=None):
+    """
+    验证所有 ARB 文件
+
+    sort 为 True 时在同一次读取中完成排序；coverage_json / coverage_csv 指定时导出覆盖矩阵。
+    """
     try:
         # 获取所有 arb 文件
         arb_files = glob.glob('./assets/translations/*.arb')
@@ -66,89 +357,35 @@ def validate_arb_files():
             sys.exit(1)
 
         print_info(f"找到 {len(arb_files)} 个 ARB 文件")
-        
-        # 首先读取所有文件的内容
-        file_contents = {}
-        for arb_file in arb_files:
-            try:
-                with open(arb_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                file_contents[arb_file] = data
-            except json.JSONDecodeError:
-                print_error(f"文件 {arb_file} 不是有效的 JSON 格式")
-                error_count += 1
-            except Exception as e:
-                print_error(f"读取文件 {arb_file} 时出错: {e}")
-                error_count += 1
-
-        if error_count > 0:
-            print_error("文件读取阶段发现错误，停止验证")
-            sys.exit(1)
+        result = run_arb_engine(arb_files, sort=sort)
+        if sort:
+            modified_count = sum(1 for f in result.files if f.modified)
+            print_success(f"排序完成，实际修改了 {modified_count} 个文件，{len(result.files) - modified_count} 个文件无需写入")
 
-        # 获取所有文件的键集合
-        all_keys = set()
-        for data in file_contents.values():
-            all_keys.update(k for k in data.keys() if not k.startswith('@'))
-
-        # 验证每个文件
-        for arb_file, data in file_contents.items():
-            print_step("验证", f"正在验证文件: {os.path.basename(arb_file)}")
-            
-            # 检查必要的字段
-            if '@@locale' not in data:
-                print_error(f"文件 {arb_file} 缺少 @@locale 字段")
-                error_count += 1
-                continue
+        if result.coverage is not None:
+            print_coverage_summary(result.coverage)
+            export_coverage(result.coverage, coverage_json, coverage_csv)
 
-            # 检查是否缺少其他文件中的键
-            file_keys = set(k for k in data.keys() if not k.startswith('@'))
-            missing_keys = all_keys - file_keys
-            if missing_keys:
-                print_error(f"文件 {arb_file} 缺少以下键:\n" + ",\n".join(sorted(missing_keys)))
-                error_count += 1
-
-            # 检查翻译键值
-            for key, value in data.items():
-                if key.startswith('@'):  # 跳过元数据
-                    continue
-                
-                if not isinstance(value, str):
-                    print_error(f"键 {key} 的值不是字符串类型")
-                    error_count += 1
-                    continue
-
-                # 检查占位符
-                if '{' in value and '}' in value:
-                    # 检查占位符格式
-                    import re
-                    placeholders = re.findall(r'\{([^}]+)\}', value)
-                    for placeholder in placeholders:
-                        if not placeholder.isalnum() and not placeholder.startswith('_'):
-                            print_error(f"键 {key} 包含无效的占位符: {placeholder}")
-                            error_count += 1
-
-            if error_count == 0:
-                print_success(f"文件 {os.path.basename(arb_file)} 验证通过")
-
-        if error_count > 0:
-            print_error(f"验证失败：发现 {error_count} 个错误")
+        if not report_validation_result(result):
             sys.exit(1)
-        else:
-            print_success("所有文件验证通过")
+        return result
 
     except Exception as e:
         print_error(f"验证过程中出错: {e}")
         sys.exit(1)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="排序并验证 assets/translations 下的 ARB 文件")
+    parser.add_argument('--coverage-json', help='导出语言 × 键覆盖矩阵（JSON，按语言列出缺失键）')
+    parser.add_argument('--coverage-csv', help='导出语言 × 键覆盖矩阵（CSV，每行一个键）')
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
     try:
-        print_step("开始", "开始排序翻译文件")
-        sort_all_arb_files()
-        print_success("排序完成")
-        
-        print_step("开始", "开始验证翻译文件")
-        validate_arb_files()
-        print_success("验证完成")
+        print_step("开始", "开始排序并验证翻译文件")
+        validate_arb_files(sort=True, coverage_json=args.coverage_json, coverage_csv=args.coverage_csv)
+        print_success("排序和验证完成")
     except Exception as e:
         print_error(f"执行过程中出错: {e}")
         sys.exit(1)